@@ -0,0 +1,29 @@
+"""GTK application object"""
+
+import gi
+gi.require_version("Gtk", "4.0")
+from gi.repository import Gtk
+
+from startup_trace import StartupTrace
+from ui.main_window import NetworkManagerWindow
+from ui.styles import StyleManager
+
+class NetworkManagerApp(Gtk.Application):
+    """Main application class"""
+    
+    def __init__(self):
+        super().__init__(application_id="com.network.manager")
+        self.exit_status = 0
+    
+    def do_activate(self):
+        """Application activation"""
+        StyleManager.apply_styles()
+        win = NetworkManagerWindow(self)
+        win.present()
+        StartupTrace.mark("window presented")
+    
+    def fail(self, message: str):
+        """Quit with an error status after a fatal startup problem"""
+        print(message)
+        self.exit_status = 1
+        self.quit()
@@ -0,0 +1,25 @@
+"""Pluggable NetworkManager backends used by NetworkService"""
+
+from backends.base import (NetworkBackend, BackendError, ActivationFailedError,
+                           ConnectionNotFoundError, ACTIVATION_TIMEOUT)
+
+BACKEND_NAMES = ("auto", "dbus", "nmcli")
+
+def create_backend(name: str = "auto") -> NetworkBackend:
+    """Create a backend by name; "auto" prefers D-Bus and falls back to nmcli"""
+    if name not in BACKEND_NAMES:
+        raise ValueError(f"Unknown backend '{name}', expected one of {', '.join(BACKEND_NAMES)}")
+
+    if name in ("auto", "dbus"):
+        try:
+            from backends.dbus_backend import DBusBackend
+            backend = DBusBackend()
+            if name == "dbus" or backend.check_available()[0]:
+                return backend
+        except Exception as e:
+            if name == "dbus":
+                raise
+            print(f"D-Bus backend unavailable, falling back to nmcli: {e}")
+
+    from backends.nmcli_backend import NmcliBackend
+    return NmcliBackend()
@@ -0,0 +1,114 @@
+"""Backend interface shared by the nmcli and D-Bus implementations"""
+
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from models import ActivationState, NetworkEvent, NetworkInfo, SavedConnection
+
+MonitorCallback = Callable[[Set[NetworkEvent]], None]
+# Receives each activation stage as it is reached, with a reason for FAILED
+ActivationCallback = Callable[[ActivationState, Optional[str]], None]
+
+# How long connect() and activate_connection() wait for activation by default
+ACTIVATION_TIMEOUT = 90.0
+
+class BackendError(Exception):
+    """Generic failure reported by a backend"""
+
+class ActivationFailedError(BackendError):
+    """Raised when NetworkManager could not activate a connection"""
+
+class ConnectionNotFoundError(BackendError):
+    """Raised when a saved connection profile does not exist (any more)"""
+
+class NetworkBackend:
+    """Operations NetworkService needs from NetworkManager.
+
+    Backends raise exceptions on failure; NetworkService is responsible for
+    turning them into the (success, message) results used by the UI.
+    """
+
+    name = "base"
+
+    def check_available(self) -> Tuple[bool, str]:
+        """Return whether NetworkManager can be reached, and why not if it can't"""
+        raise NotImplementedError
+
+    def get_wifi_enabled(self) -> bool:
+        raise NotImplementedError
+
+    def set_wifi_enabled(self, enabled: bool) -> None:
+        raise NotImplementedError
+
+    def rescan(self, timeout: float) -> List[NetworkInfo]:
+        """Rescan and return the access points once the scan has completed.
+
+        Waits at most timeout seconds for the device to report completion.
+        """
+        raise NotImplementedError
+
+    def rescan_ssids(self, ssids: List[str], timeout: float) -> Tuple[List[NetworkInfo], bool]:
+        """Probe only for the given SSIDs and return their access points.
+
+        A directed scan is much quicker than a full sweep and also finds
+        hidden networks. Also returns whether the scan was seen to finish
+        within timeout; if not, the access points may predate it. Backends
+        without a directed scan fall back to a full rescan.
+        """
+        return [network for network in self.rescan(timeout) if network.ssid in ssids], True
+
+    def get_access_points(self) -> List[NetworkInfo]:
+        """Return the access points NetworkManager currently knows about"""
+        raise NotImplementedError
+
+    def get_saved_connections(self) -> List[SavedConnection]:
+        """Return every saved WiFi profile together with its SSID"""
+        raise NotImplementedError
+
+    def connect(self, ssid: str, password: Optional[str] = None,
+                on_state: Optional[ActivationCallback] = None,
+                timeout: float = ACTIVATION_TIMEOUT) -> None:
+        """Connect by SSID, creating a profile if needed.
+
+        Activation stages are passed to on_state (from the calling thread)
+        as they happen. Gives up with ActivationFailedError after timeout
+        seconds, or as soon as the credentials are rejected.
+        """
+        raise NotImplementedError
+
+    def activate_connection(self, uuid: str, bssid: Optional[str] = None,
+                            on_state: Optional[ActivationCallback] = None,
+                            timeout: float = ACTIVATION_TIMEOUT) -> None:
+        """Bring up a saved profile by UUID, optionally on a specific access point.
+
+        Raises ConnectionNotFoundError if there is no such profile or access
+        point, and ActivationFailedError if activation itself failed.
+        Progress and deadline work as for connect().
+        """
+        raise NotImplementedError
+
+    def cancel_activation(self) -> None:
+        """Abort a connect() or activate_connection() running on another thread.
+
+        The pending connection is deactivated, which makes that call fail
+        with ActivationFailedError.
+        """
+        raise NotImplementedError
+
+    def disconnect(self, ssid: str) -> None:
+        raise NotImplementedError
+
+    def delete_connections(self, uuids: List[str]) -> Dict[str, str]:
+        """Delete several saved connections by UUID.
+
+        Returns an error message for each UUID that could not be deleted, so
+        an empty dict means every profile is gone.
+        """
+        raise NotImplementedError
+
+    def start_monitor(self, callback: MonitorCallback) -> Callable[[], None]:
+        """Stream change notifications to callback on the GLib main loop.
+
+        Must be called from the main thread. Returns a function that stops
+        the monitor.
+        """
+        raise NotImplementedError
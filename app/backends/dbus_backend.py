@@ -0,0 +1,527 @@
+"""NetworkManager backend talking to the daemon directly over D-Bus.
+
+The backend uses the system bus by default. Gio honours
+DBUS_SYSTEM_BUS_ADDRESS, so it can be pointed at a private bus running
+python-dbusmock's NetworkManager template for testing, or handed an
+already-open Gio.DBusConnection.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from gi.repository import Gio, GLib
+
+from models import ActivationState, NetworkEvent, NetworkInfo, SavedConnection
+from profiler import Profiler, DBUS
+from backends.base import (NetworkBackend, BackendError, ActivationFailedError,
+                           ConnectionNotFoundError, MonitorCallback,
+                           ActivationCallback, ACTIVATION_TIMEOUT)
+
+NM_BUS_NAME = "org.freedesktop.NetworkManager"
+NM_PATH = "/org/freedesktop/NetworkManager"
+NM_IFACE = "org.freedesktop.NetworkManager"
+NM_SETTINGS_PATH = "/org/freedesktop/NetworkManager/Settings"
+NM_SETTINGS_IFACE = "org.freedesktop.NetworkManager.Settings"
+NM_CONNECTION_IFACE = "org.freedesktop.NetworkManager.Settings.Connection"
+NM_DEVICE_IFACE = "org.freedesktop.NetworkManager.Device"
+NM_WIRELESS_IFACE = "org.freedesktop.NetworkManager.Device.Wireless"
+NM_AP_IFACE = "org.freedesktop.NetworkManager.AccessPoint"
+NM_ACTIVE_IFACE = "org.freedesktop.NetworkManager.Connection.Active"
+PROPERTIES_IFACE = "org.freedesktop.DBus.Properties"
+
+NM_DEVICE_TYPE_WIFI = 2
+
+NM_ACTIVE_CONNECTION_STATE_ACTIVATED = 2
+NM_ACTIVE_CONNECTION_STATE_DEACTIVATING = 3
+NM_ACTIVE_CONNECTION_STATE_DEACTIVATED = 4
+
+NM_DEVICE_STATE_FAILED = 120
+
+# Device states while a connection is being activated, and the stage each one reports
+DEVICE_ACTIVATION_STATES = {
+    40: ActivationState.PREPARING,
+    50: ActivationState.CONFIGURING,
+    60: ActivationState.NEED_AUTH,
+    70: ActivationState.IP_CONFIG,
+    80: ActivationState.IP_CHECK,
+    90: ActivationState.IP_CHECK,  # secondary connections
+}
+
+# Readable text for the NMDeviceStateReason values a WiFi activation usually fails with
+DEVICE_STATE_REASONS = {
+    4: "configuration failed",
+    5: "no IP configuration available",
+    7: "wrong password or missing secrets",
+    8: "the access point disconnected",
+    9: "WiFi configuration failed",
+    10: "WiFi authentication failed",
+    11: "WiFi authentication timed out",
+    15: "DHCP could not start",
+    16: "DHCP error",
+    17: "no address from DHCP",
+    39: "cancelled",
+    53: "network not found",
+}
+
+NM_802_11_AP_FLAGS_PRIVACY = 0x1
+NM_802_11_AP_SEC_KEY_MGMT_PSK = 0x100
+NM_802_11_AP_SEC_KEY_MGMT_802_1X = 0x200
+NM_802_11_AP_SEC_KEY_MGMT_SAE = 0x400
+NM_802_11_AP_SEC_KEY_MGMT_OWE = 0x800
+NM_802_11_AP_SEC_KEY_MGMT_OWE_TM = 0x1000
+
+# Same labels nmcli prints in its MODE column
+AP_MODES = {1: "Ad-Hoc", 2: "Infra", 3: "AP", 4: "Mesh"}
+
+# Which PropertiesChanged entries matter to the UI, per interface
+PROPERTY_EVENTS = {
+    NM_IFACE: {
+        "WirelessEnabled": NetworkEvent.RADIO,
+        "ActiveConnections": NetworkEvent.CONNECTION_STATE,
+        "State": NetworkEvent.CONNECTION_STATE,
+    },
+    NM_DEVICE_IFACE: {
+        "State": NetworkEvent.CONNECTION_STATE,
+    },
+    NM_WIRELESS_IFACE: {
+        "AccessPoints": NetworkEvent.ACCESS_POINTS,
+        "ActiveAccessPoint": NetworkEvent.CONNECTION_STATE,
+    },
+    NM_AP_IFACE: {
+        "Strength": NetworkEvent.SIGNAL,
+    },
+    NM_ACTIVE_IFACE: {
+        "State": NetworkEvent.CONNECTION_STATE,
+    },
+}
+
+# (interface, member) of plain signals and the event each one maps to
+SIGNAL_EVENTS = {
+    # An adapter plugged in or out changes WiFi availability, like the radio switch
+    (NM_IFACE, "DeviceAdded"): NetworkEvent.RADIO,
+    (NM_IFACE, "DeviceRemoved"): NetworkEvent.RADIO,
+    (NM_WIRELESS_IFACE, "AccessPointAdded"): NetworkEvent.ACCESS_POINTS,
+    (NM_WIRELESS_IFACE, "AccessPointRemoved"): NetworkEvent.ACCESS_POINTS,
+    (NM_SETTINGS_IFACE, "NewConnection"): NetworkEvent.SAVED_CONNECTIONS,
+    (NM_SETTINGS_IFACE, "ConnectionRemoved"): NetworkEvent.SAVED_CONNECTIONS,
+    (NM_CONNECTION_IFACE, "Updated"): NetworkEvent.SAVED_CONNECTIONS,
+}
+
+DBUS_TIMEOUT_MS = 25000
+ACTIVATION_POLL_INTERVAL = 0.1
+SCAN_POLL_INTERVAL = 0.05
+
+def channel_from_frequency(frequency: int) -> Optional[int]:
+    """Map a centre frequency in MHz to its 802.11 channel number"""
+    if frequency == 2484:
+        return 14
+    if 2412 <= frequency <= 2472:
+        return (frequency - 2407) // 5
+    if 5150 <= frequency <= 5895:
+        return (frequency - 5000) // 5
+    if 5955 <= frequency <= 7115:
+        return (frequency - 5950) // 5
+    return None
+
+def security_from_flags(flags: int, wpa_flags: int, rsn_flags: int) -> str:
+    """Build the same security summary nmcli prints (e.g. "WPA1 WPA2")"""
+    parts = []
+    if flags & NM_802_11_AP_FLAGS_PRIVACY and not wpa_flags and not rsn_flags:
+        parts.append("WEP")
+    if wpa_flags:
+        parts.append("WPA1")
+    if rsn_flags & (NM_802_11_AP_SEC_KEY_MGMT_PSK | NM_802_11_AP_SEC_KEY_MGMT_802_1X):
+        parts.append("WPA2")
+    if rsn_flags & NM_802_11_AP_SEC_KEY_MGMT_SAE:
+        parts.append("WPA3")
+    if rsn_flags & (NM_802_11_AP_SEC_KEY_MGMT_OWE | NM_802_11_AP_SEC_KEY_MGMT_OWE_TM):
+        parts.append("OWE")
+    if (wpa_flags | rsn_flags) & NM_802_11_AP_SEC_KEY_MGMT_802_1X:
+        parts.append("802.1X")
+    return " ".join(parts)
+
+def decode_ssid(raw) -> str:
+    """Decode an SSID byte array (bytes or list of ints depending on PyGObject)"""
+    return bytes(raw or b"").decode("utf-8", "replace")
+
+class DBusBackend(NetworkBackend):
+    """Backend that calls org.freedesktop.NetworkManager without spawning processes"""
+
+    name = "dbus"
+
+    def __init__(self, connection: Optional[Gio.DBusConnection] = None):
+        self._bus = connection or Gio.bus_get_sync(Gio.BusType.SYSTEM, None)
+        self._device_path: Optional[str] = None
+        # Object path of each access point from the last listing, by BSSID
+        self._ap_paths: Dict[str, str] = {}
+        # Set by cancel_activation(); the activating thread deactivates and gives up
+        self._cancel = threading.Event()
+
+    def _call(self, path: str, iface: str, method: str,
+              args: Optional[GLib.Variant] = None, reply_type: Optional[str] = None,
+              timeout_ms: int = DBUS_TIMEOUT_MS) -> tuple:
+        with Profiler.span(f"{iface.rsplit('.', 1)[-1]}.{method}", DBUS):
+            try:
+                result = self._bus.call_sync(
+                    NM_BUS_NAME, path, iface, method, args,
+                    GLib.VariantType.new(reply_type) if reply_type else None,
+                    Gio.DBusCallFlags.NONE, timeout_ms, None
+                )
+            except GLib.Error:
+                if path == self._device_path:
+                    # The adapter may have been unplugged or re-created; look it up again next time
+                    self._device_path = None
+                raise
+        return result.unpack() if result is not None else ()
+
+    def _get(self, path: str, iface: str, prop: str) -> Any:
+        return self._call(path, PROPERTIES_IFACE, "Get",
+                          GLib.Variant("(ss)", (iface, prop)), "(v)")[0]
+
+    def _get_all(self, path: str, iface: str) -> Dict[str, Any]:
+        return self._call(path, PROPERTIES_IFACE, "GetAll",
+                          GLib.Variant("(s)", (iface,)), "(a{sv})")[0]
+
+    def _wifi_device(self) -> str:
+        """Return the object path of the first WiFi device, cached until a call on it fails"""
+        if self._device_path is not None:
+            return self._device_path
+
+        devices = self._call(NM_PATH, NM_IFACE, "GetDevices", None, "(ao)")[0]
+        for path in devices:
+            if self._get(path, NM_DEVICE_IFACE, "DeviceType") == NM_DEVICE_TYPE_WIFI:
+                self._device_path = path
+                return path
+        raise BackendError("No WiFi device found")
+
+    def _connection_paths(self) -> List[str]:
+        return self._call(NM_SETTINGS_PATH, NM_SETTINGS_IFACE, "ListConnections", None, "(ao)")[0]
+
+    def _connection_settings(self, path: str) -> Dict[str, Dict[str, Any]]:
+        return self._call(path, NM_CONNECTION_IFACE, "GetSettings", None, "(a{sa{sv}})")[0]
+
+    def _find_access_point(self, ssid: str) -> Tuple[str, Dict[str, Any]]:
+        """Return the strongest access point advertising ssid, or ("/", {})"""
+        device = self._wifi_device()
+        best_path, best_props = "/", {}
+        for path in self._call(device, NM_WIRELESS_IFACE, "GetAllAccessPoints", None, "(ao)")[0]:
+            try:
+                props = self._get_all(path, NM_AP_IFACE)
+            except GLib.Error:
+                continue  # AP disappeared between listing and reading it
+            if decode_ssid(props.get("Ssid")) != ssid:
+                continue
+            if props.get("Strength", 0) > best_props.get("Strength", -1):
+                best_path, best_props = path, props
+        return best_path, best_props
+
+    def _find_connection_for_ssid(self, ssid: str) -> Optional[str]:
+        for path in self._connection_paths():
+            wireless = self._connection_settings(path).get("802-11-wireless", {})
+            if decode_ssid(wireless.get("ssid")) == ssid:
+                return path
+        return None
+
+    def _wait_for_activation(self, active_path: str, name: str, on_state: Optional[ActivationCallback],
+                             timeout: float, password_given: bool) -> None:
+        """Poll the ActiveConnection until it is activated or has failed, reporting each stage.
+
+        There is no secret agent here, so a secrets request after we supplied
+        the password, or a repeated one, means the credentials were rejected;
+        that fails right away instead of waiting for NetworkManager to give up.
+        """
+        device = self._wifi_device()
+        report = on_state or (lambda state, reason: None)
+        deadline = time.monotonic() + timeout
+        stage: Optional[ActivationState] = None
+        auth_requests = 0
+        reason = 0
+
+        def give_up(message: str):
+            try:
+                self._call(NM_PATH, NM_IFACE, "DeactivateConnection", GLib.Variant("(o)", (active_path,)))
+            except GLib.Error:
+                pass  # already gone
+            report(ActivationState.FAILED, message)
+            return ActivationFailedError(f"Connection activation failed for {name}: {message}")
+
+        while time.monotonic() < deadline:
+            if self._cancel.is_set():
+                raise give_up("cancelled")
+            try:
+                state = self._get(active_path, NM_ACTIVE_IFACE, "State")
+            except GLib.Error:
+                # NetworkManager drops the object once activation has failed
+                state = NM_ACTIVE_CONNECTION_STATE_DEACTIVATED
+            device_state, device_reason = self._get(device, NM_DEVICE_IFACE, "StateReason")
+            if device_state == NM_DEVICE_STATE_FAILED:
+                reason = device_reason
+
+            if state == NM_ACTIVE_CONNECTION_STATE_ACTIVATED:
+                report(ActivationState.ACTIVATED, None)
+                return
+            if state in (NM_ACTIVE_CONNECTION_STATE_DEACTIVATING,
+                         NM_ACTIVE_CONNECTION_STATE_DEACTIVATED):
+                message = DEVICE_STATE_REASONS.get(reason or device_reason, "unknown reason")
+                report(ActivationState.FAILED, message)
+                raise ActivationFailedError(f"Connection activation failed for {name}: {message}")
+
+            # The device may still show the previous connection until this one starts
+            current = DEVICE_ACTIVATION_STATES.get(device_state)
+            if current is not None and current != stage:
+                stage = current
+                report(stage, None)
+                if stage == ActivationState.NEED_AUTH:
+                    auth_requests += 1
+                    if password_given or auth_requests > 1:
+                        raise give_up(DEVICE_STATE_REASONS[7])
+            time.sleep(ACTIVATION_POLL_INTERVAL)
+
+        raise give_up(f"timed out after {timeout:g}s")
+
+    @staticmethod
+    def _security_settings(ap_props: Dict[str, Any], password: str) -> Dict[str, GLib.Variant]:
+        """Build the 802-11-wireless-security setting for a new profile"""
+        wpa_flags = ap_props.get("WpaFlags", 0)
+        rsn_flags = ap_props.get("RsnFlags", 0)
+        if ap_props.get("Flags", 0) & NM_802_11_AP_FLAGS_PRIVACY and not wpa_flags and not rsn_flags:
+            return {
+                "key-mgmt": GLib.Variant("s", "none"),
+                "wep-key0": GLib.Variant("s", password),
+            }
+        if rsn_flags & NM_802_11_AP_SEC_KEY_MGMT_SAE and not rsn_flags & NM_802_11_AP_SEC_KEY_MGMT_PSK:
+            key_mgmt = "sae"
+        else:
+            key_mgmt = "wpa-psk"
+        return {
+            "key-mgmt": GLib.Variant("s", key_mgmt),
+            "psk": GLib.Variant("s", password),
+        }
+
+    @staticmethod
+    def _network_from_ap(props: Dict[str, Any], is_active: bool) -> NetworkInfo:
+        frequency = props.get("Frequency", 0)
+        security = security_from_flags(
+            props.get("Flags", 0), props.get("WpaFlags", 0), props.get("RsnFlags", 0)
+        )
+        return NetworkInfo(
+            ssid=decode_ssid(props.get("Ssid")),
+            signal=props.get("Strength", 0),
+            requires_password=bool(security),
+            is_connected=is_active,
+            bssid=props.get("HwAddress"),
+            frequency=frequency or None,
+            channel=channel_from_frequency(frequency),
+            rate=props.get("MaxBitrate", 0) // 1000 or None,
+            mode=AP_MODES.get(props.get("Mode")),
+            security=security
+        )
+
+    def check_available(self) -> Tuple[bool, str]:
+        try:
+            result = self._bus.call_sync(
+                "org.freedesktop.DBus", "/org/freedesktop/DBus", "org.freedesktop.DBus",
+                "NameHasOwner", GLib.Variant("(s)", (NM_BUS_NAME,)),
+                GLib.VariantType.new("(b)"), Gio.DBusCallFlags.NONE, 5000, None
+            )
+        except GLib.Error as e:
+            return False, f"Error: Could not check NetworkManager status: {e.message}"
+
+        if not result.unpack()[0]:
+            return False, ("Error: NetworkManager is not running.\n"
+                           "Please start the NetworkManager service.")
+        return True, "NetworkManager is running"
+
+    def get_wifi_enabled(self) -> bool:
+        return bool(self._get(NM_PATH, NM_IFACE, "WirelessEnabled"))
+
+    def set_wifi_enabled(self, enabled: bool) -> None:
+        self._call(NM_PATH, PROPERTIES_IFACE, "Set",
+                   GLib.Variant("(ssv)", (NM_IFACE, "WirelessEnabled", GLib.Variant("b", enabled))))
+
+    def _request_scan(self, options: Dict[str, GLib.Variant], timeout: float) -> bool:
+        """Start a scan and wait (at most timeout seconds) for the device to finish it.
+
+        Returns whether the scan finished in time.
+        """
+        device = self._wifi_device()
+        # LastScan (CLOCK_BOOTTIME ms) changes when the device finishes a scan
+        last_scan = self._get(device, NM_WIRELESS_IFACE, "LastScan")
+
+        try:
+            self._call(device, NM_WIRELESS_IFACE, "RequestScan",
+                       GLib.Variant("(a{sv})", (options,)))
+        except GLib.Error as e:
+            # Scanning is refused while busy (e.g. activating); current results stand
+            print(f"WiFi rescan not started: {e.message}")
+            return False
+
+        deadline = time.monotonic() + timeout
+        while self._get(device, NM_WIRELESS_IFACE, "LastScan") == last_scan:
+            if time.monotonic() >= deadline:
+                print(f"WiFi rescan did not finish within {timeout:.0f}s")
+                return False
+            time.sleep(SCAN_POLL_INTERVAL)
+        return True
+
+    def rescan(self, timeout: float) -> List[NetworkInfo]:
+        self._request_scan({}, timeout)
+        return self.get_access_points()
+
+    def rescan_ssids(self, ssids: List[str], timeout: float) -> Tuple[List[NetworkInfo], bool]:
+        # Probe requests for just these SSIDs, which also makes hidden networks answer
+        finished = self._request_scan({"ssids": GLib.Variant("aay", [ssid.encode() for ssid in ssids])}, timeout)
+        return [network for network in self.get_access_points() if network.ssid in ssids], finished
+
+    def get_access_points(self) -> List[NetworkInfo]:
+        device = self._wifi_device()
+        active_ap = self._get(device, NM_WIRELESS_IFACE, "ActiveAccessPoint")
+
+        networks = []
+        ap_paths = {}
+        for path in self._call(device, NM_WIRELESS_IFACE, "GetAllAccessPoints", None, "(ao)")[0]:
+            try:
+                props = self._get_all(path, NM_AP_IFACE)
+            except GLib.Error:
+                continue  # AP disappeared between listing and reading it
+            network = self._network_from_ap(props, path == active_ap)
+            if network.bssid:
+                ap_paths[network.bssid] = path
+            networks.append(network)
+        self._ap_paths = ap_paths
+        return networks
+
+    def get_saved_connections(self) -> List[SavedConnection]:
+        saved = []
+        for path in self._connection_paths():
+            try:
+                settings = self._connection_settings(path)
+            except GLib.Error:
+                continue  # profile removed while we were listing
+            wireless = settings.get("802-11-wireless")
+            if not wireless:
+                continue
+            ssid = decode_ssid(wireless.get("ssid"))
+            if not ssid:
+                continue
+            connection = settings.get("connection", {})
+            saved.append(SavedConnection(
+                name=connection.get("id", ""),
+                uuid=connection.get("uuid", ""),
+                ssid=ssid,
+                autoconnect_priority=connection.get("autoconnect-priority", 0),
+                timestamp=connection.get("timestamp", 0)
+            ))
+        return saved
+
+    def connect(self, ssid: str, password: Optional[str] = None,
+                on_state: Optional[ActivationCallback] = None,
+                timeout: float = ACTIVATION_TIMEOUT) -> None:
+        self._cancel.clear()
+        device = self._wifi_device()
+        ap_path, ap_props = self._find_access_point(ssid)
+
+        try:
+            saved_path = None if password else self._find_connection_for_ssid(ssid)
+            if saved_path:
+                active_path = self._call(
+                    NM_PATH, NM_IFACE, "ActivateConnection",
+                    GLib.Variant("(ooo)", (saved_path, device, ap_path)), "(o)"
+                )[0]
+            else:
+                if ap_path == "/":
+                    raise ActivationFailedError(f"No network with SSID '{ssid}' found")
+                settings = {"802-11-wireless": {"ssid": GLib.Variant("ay", ssid.encode())}}
+                if password:
+                    settings["802-11-wireless-security"] = self._security_settings(ap_props, password)
+                _, active_path = self._call(
+                    NM_PATH, NM_IFACE, "AddAndActivateConnection",
+                    GLib.Variant("(a{sa{sv}}oo)", (settings, device, ap_path)), "(oo)"
+                )
+        except GLib.Error as e:
+            raise ActivationFailedError(e.message) from e
+
+        self._wait_for_activation(active_path, ssid, on_state, timeout, password_given=bool(password))
+
+    def activate_connection(self, uuid: str, bssid: Optional[str] = None,
+                            on_state: Optional[ActivationCallback] = None,
+                            timeout: float = ACTIVATION_TIMEOUT) -> None:
+        self._cancel.clear()
+        device = self._wifi_device()
+        try:
+            connection_path = self._call(NM_SETTINGS_PATH, NM_SETTINGS_IFACE, "GetConnectionByUuid",
+                                         GLib.Variant("(s)", (uuid,)), "(o)")[0]
+        except GLib.Error as e:
+            raise ConnectionNotFoundError(e.message) from e
+
+        # "/" lets NetworkManager pick the access point itself
+        ap_path = self._ap_paths.get(bssid, "/") if bssid else "/"
+        try:
+            active_path = self._call(
+                NM_PATH, NM_IFACE, "ActivateConnection",
+                GLib.Variant("(ooo)", (connection_path, device, ap_path)), "(o)"
+            )[0]
+        except GLib.Error as e:
+            if ap_path == "/":
+                raise ActivationFailedError(e.message) from e
+            # The access point may have gone since the last listing; the caller retries unpinned
+            raise ConnectionNotFoundError(f"Activating on {bssid} failed: {e.message}") from e
+
+        self._wait_for_activation(active_path, uuid, on_state, timeout, password_given=False)
+
+    def cancel_activation(self) -> None:
+        self._cancel.set()
+
+    def disconnect(self, ssid: str) -> None:
+        for active_path in self._get(NM_PATH, NM_IFACE, "ActiveConnections"):
+            try:
+                connection_path = self._get(active_path, NM_ACTIVE_IFACE, "Connection")
+                wireless = self._connection_settings(connection_path).get("802-11-wireless", {})
+            except GLib.Error:
+                continue
+            if decode_ssid(wireless.get("ssid")) == ssid:
+                self._call(NM_PATH, NM_IFACE, "DeactivateConnection",
+                           GLib.Variant("(o)", (active_path,)))
+                return
+        raise BackendError(f"No active connection for '{ssid}'")
+
+    def delete_connections(self, uuids: List[str]) -> Dict[str, str]:
+        # Looked up by UUID directly instead of reading every profile's settings
+        failed = {}
+        for uuid in uuids:
+            try:
+                path = self._call(NM_SETTINGS_PATH, NM_SETTINGS_IFACE, "GetConnectionByUuid",
+                                  GLib.Variant("(s)", (uuid,)), "(o)")[0]
+                self._call(path, NM_CONNECTION_IFACE, "Delete")
+            except GLib.Error as e:
+                failed[uuid] = e.message
+        return failed
+
+    def start_monitor(self, callback: MonitorCallback) -> Callable[[], None]:
+        def on_properties_changed(_bus, _sender, _path, _iface, _signal, params):
+            iface, changed, _invalidated = params.unpack()
+            mapping = PROPERTY_EVENTS.get(iface, {})
+            events: Set[NetworkEvent] = {mapping[name] for name in changed if name in mapping}
+            if events:
+                callback(events)
+
+        def on_signal(_bus, _sender, _path, iface, signal, _params):
+            if iface == NM_IFACE:
+                self._device_path = None  # the WiFi device may be another object now
+            callback({SIGNAL_EVENTS[(iface, signal)]})
+
+        subscriptions = [self._bus.signal_subscribe(
+            NM_BUS_NAME, PROPERTIES_IFACE, "PropertiesChanged", None, None,
+            Gio.DBusSignalFlags.NONE, on_properties_changed
+        )]
+        for iface, signal in SIGNAL_EVENTS:
+            subscriptions.append(self._bus.signal_subscribe(
+                NM_BUS_NAME, iface, signal, None, None,
+                Gio.DBusSignalFlags.NONE, on_signal
+            ))
+
+        def stop():
+            for subscription in subscriptions:
+                self._bus.signal_unsubscribe(subscription)
+        return stop
@@ -0,0 +1,535 @@
+"""NetworkManager backend built on the nmcli command line tool"""
+
+import os
+import re
+import shutil
+import subprocess
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+import nmcli
+from nmcli.data import DeviceWifi
+from gi.repository import Gio, GLib
+
+from models import ActivationState, NetworkEvent, NetworkInfo, SavedConnection
+from profiler import Profiler, SUBPROCESS
+from backends.base import (NetworkBackend, ActivationFailedError,
+                           ConnectionNotFoundError, MonitorCallback,
+                           ActivationCallback, ACTIVATION_TIMEOUT)
+
+def _traced_run(commands: List[str], **kwargs) -> subprocess.CompletedProcess:
+    """subprocess.run for the nmcli package, timed as one span per process"""
+    # Never put a password in the trace
+    shown = ["***" if previous == "password" else arg
+             for previous, arg in zip([""] + commands, commands)]
+    with Profiler.span(" ".join(shown), SUBPROCESS):
+        return subprocess.run(commands, **kwargs)
+
+def _traced_run_c(commands: List[str], **kwargs) -> subprocess.CompletedProcess:
+    """_traced_run with nmcli's messages in English, for commands whose text we parse"""
+    # LC_ALL overrides the user's LC_MESSAGES as well as LANG
+    kwargs["env"] = dict(kwargs.get("env") or os.environ, LC_ALL="C")
+    return _traced_run(commands, **kwargs)
+
+# Our own command runner and controls, so the package's shared ones are left alone
+_syscmd = nmcli.SystemCommand(subprocess_run=_traced_run)
+_syscmd.disable_use_sudo()
+_syscmd.set_lang(os.environ.get("LANG") or "C.UTF-8")
+_connection = nmcli.ConnectionControl(_syscmd)
+_device = nmcli.DeviceControl(_syscmd)
+_radio = nmcli.RadioControl(_syscmd)
+
+# Same, in the C locale
+_c_syscmd = nmcli.SystemCommand(subprocess_run=_traced_run_c)
+_c_syscmd.disable_use_sudo()
+_c_connection = nmcli.ConnectionControl(_c_syscmd)
+
+# Line `connection delete` prints (in the C locale) for each profile it removed
+DELETED_PATTERN = re.compile(r"\(([0-9a-fA-F-]+)\) successfully deleted")
+
+# Device states printed by `nmcli device monitor` while a connection comes up
+MONITOR_STAGES = {
+    "connecting (prepare)": ActivationState.PREPARING,
+    "connecting (configuring)": ActivationState.CONFIGURING,
+    "connecting (need authentication)": ActivationState.NEED_AUTH,
+    "connecting (getting IP configuration)": ActivationState.IP_CONFIG,
+    "connecting (checking IP connectivity)": ActivationState.IP_CHECK,
+    "connecting (starting secondary connections)": ActivationState.IP_CHECK,
+    "connection failed": ActivationState.FAILED,
+}
+
+# How often the access point list is re-read while a directed scan runs
+RESCAN_POLL_INTERVAL = 0.5
+
+# Exactly the `device wifi list` columns NetworkInfo needs, in parse order
+WIFI_LIST_FIELDS = "IN-USE,BSSID,SSID,MODE,CHAN,FREQ,RATE,SIGNAL,SECURITY"
+
+def split_terse(line: str) -> List[str]:
+    """Split one line of `nmcli -t` output into fields.
+
+    Terse tabular output separates fields with ':' and escapes ':' and '\\' inside
+    values with a backslash (BSSIDs and SSIDs contain both).
+    """
+    fields = []
+    current = []
+    chars = iter(line)
+    for char in chars:
+        if char == "\\":
+            current.append(next(chars, ""))
+        elif char == ":":
+            fields.append("".join(current))
+            current = []
+        else:
+            current.append(char)
+    fields.append("".join(current))
+    return fields
+
+def _leading_int(value: str) -> int:
+    """Parse values such as "2412 MHz" or "54 Mbit/s" """
+    number = value.split(" ", 1)[0]
+    return int(number) if number.isdigit() else 0
+
+def _int_or_zero(value: Optional[str]) -> int:
+    """Parse a plain (possibly negative) integer field, 0 if missing"""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+class NmcliExtensions:
+    """Extended functionalities for nmcli package"""
+    
+    @staticmethod
+    def connect_to_open_or_saved_wifi(device_control_instance, ssid: str, wait: Optional[int] = None) -> None:
+        """Connect to a known WiFi network without requiring password"""
+        cmd = nmcli._helper.add_wait_option_if_needed(wait) + ['device', 'wifi', 'connect', ssid]
+                
+        try:
+            result = device_control_instance._syscmd.nmcli(cmd)
+            
+            failure_patterns = [
+                r'Connection activation failed:',
+                r'Error: Connection activation failed',
+                r'Error: No network with SSID',
+                r'Error: Failed to add/activate new connection'
+            ]
+            
+            for pattern in failure_patterns:
+                if re.search(pattern, result):
+                    raise nmcli._exception.ConnectionActivateFailedException(
+                        f'Connection activation failed for {ssid}'
+                    )
+            
+            print(f"Successfully connected to {ssid}")
+            
+        except nmcli._exception.ConnectionActivateFailedException:
+            raise
+        except Exception as e:
+            print(f"Failed to connect to {ssid}: {e}")
+            raise
+    
+    @staticmethod
+    def connection_up_uuid(connection_control_instance, uuid: str, bssid: Optional[str] = None,
+                           wait: Optional[int] = None) -> None:
+        """Activate a saved profile with `connection up uuid X [ap BSSID]`; failures raise via the exit code"""
+        cmd = nmcli._helper.add_wait_option_if_needed(wait) + ['connection', 'up', 'uuid', uuid]
+        if bssid:
+            cmd += ['ap', bssid]
+        connection_control_instance._syscmd.nmcli(cmd)
+    
+    @staticmethod
+    def delete_connections_uuid(connection_control_instance, uuids: List[str]) -> Tuple[Set[str], str]:
+        """Delete profiles with one `connection delete uuid A uuid B ...`.
+
+        Returns the UUIDs that were deleted, and nmcli's error output if it
+        failed for some of them. A zero exit status means all of them went;
+        only a failure's output is parsed, so run this in the C locale.
+        """
+        cmd = ['connection', 'delete']
+        for uuid in uuids:
+            cmd += ['uuid', uuid]
+        try:
+            connection_control_instance._syscmd.nmcli(cmd)
+            return set(uuids), ""
+        except (nmcli._exception.ConnectionDeleteFailedException, nmcli._exception.NotExistException,
+                nmcli._exception.UnspecifiedException) as e:
+            # nmcli still deletes the profiles it can, and lists them on stdout
+            cause = e.__cause__
+            if not isinstance(cause, subprocess.CalledProcessError):
+                raise
+            output = (cause.stdout or b"").decode(errors="replace")
+            errors = (cause.stderr or b"").decode(errors="replace").strip() or str(e)
+        return set(DELETED_PATTERN.findall(output)), errors
+    
+    @staticmethod
+    def wifi_list(device_control_instance, rescan: Optional[bool] = None) -> List[DeviceWifi]:
+        """List access points with one terse `device wifi list` call"""
+        cmd = ['-t', '-f', WIFI_LIST_FIELDS, 'device', 'wifi', 'list']
+        if rescan is not None:
+            cmd += ['--rescan', 'yes' if rescan else 'no']
+        output = device_control_instance._syscmd.nmcli(cmd)
+
+        networks = []
+        for line in output.splitlines():
+            fields = split_terse(line)
+            if len(fields) != 9:
+                continue
+            in_use, bssid, ssid, mode, chan, freq, rate, signal, security = fields
+            security = security.strip()
+            networks.append(DeviceWifi(
+                in_use=in_use == "*",
+                ssid=ssid,
+                bssid=bssid,
+                mode=mode,
+                chan=_leading_int(chan),
+                freq=_leading_int(freq),
+                rate=_leading_int(rate),
+                signal=_leading_int(signal),
+                security="" if security == "--" else security
+            ))
+        return networks
+
+    @staticmethod
+    def wifi_force_rescan(device_control_instance) -> List[DeviceWifi]:
+        """Force a WiFi rescan and return the refreshed networks"""
+        try:
+            # nmcli only prints the list once the rescan it triggered has finished
+            networks = NmcliExtensions.wifi_list(device_control_instance, rescan=True)
+            print("WiFi rescan completed successfully")
+            return networks
+        except Exception as e:
+            print(f"WiFi rescan failed: {e}")
+            raise
+
+    @staticmethod
+    def wifi_rescan_ssids(device_control_instance, ssids: List[str]) -> None:
+        """Ask for a directed scan of the given SSIDs with `device wifi rescan ssid X ...`"""
+        cmd = ['device', 'wifi', 'rescan']
+        for ssid in ssids:
+            cmd += ['ssid', ssid]
+        device_control_instance._syscmd.nmcli(cmd)
+
+    @staticmethod
+    def wifi_connection_uuids(connection_control_instance, wifi_types: Tuple[str, ...]) -> List[str]:
+        """UUIDs of the saved WiFi profiles, from one terse `connection show`"""
+        output = connection_control_instance._syscmd.nmcli(
+            ['-t', '-f', 'UUID,TYPE', 'connection', 'show']
+        )
+        uuids = []
+        for line in output.splitlines():
+            fields = split_terse(line)
+            if len(fields) == 2 and fields[1] in wifi_types:
+                uuids.append(fields[0])
+        return uuids
+
+    @staticmethod
+    def show_connections(connection_control_instance, uuids: List[str]) -> List[Dict[str, str]]:
+        """Fetch id, uuid, autoconnect priority, timestamp and SSID of several profiles with a single `connection show`"""
+        cmd = ['-t', '-f', 'connection.id,connection.uuid,connection.autoconnect-priority,'
+               'connection.timestamp,802-11-wireless.ssid', 'connection', 'show']
+        for uuid in uuids:
+            cmd += ['uuid', uuid]
+        output = connection_control_instance._syscmd.nmcli(cmd)
+
+        # Terse multi-profile output is one "key:value" line per field,
+        # with each profile starting at its connection.id line. nmcli only
+        # escapes tabular output, so the value is everything after the first ':'
+        records: List[Dict[str, str]] = []
+        for line in output.splitlines():
+            key, sep, value = line.partition(":")
+            if not sep:
+                continue
+            if key == "connection.id":
+                records.append({})
+            if records:
+                records[-1][key] = value
+        return records
+
+def events_from_monitor_line(line: str) -> Set[NetworkEvent]:
+    """Classify one line of `nmcli monitor` output.
+
+    nmcli monitor reports device, NetworkManager and profile changes but not
+    access point or signal updates, so those never appear here.
+    """
+    if "connection profile" in line:
+        # "<name>: connection profile created/removed/changed"
+        return {NetworkEvent.SAVED_CONNECTIONS}
+    if line.lower().startswith("networkmanager is now") or "primary connection" in line:
+        return {NetworkEvent.CONNECTION_STATE}
+    device, sep, state = line.partition(": ")
+    if sep and " " not in device:
+        # "<iface>: <state>"; a WiFi device turns unavailable when the radio is switched off
+        if state in ("unavailable", "disconnected"):
+            return {NetworkEvent.CONNECTION_STATE, NetworkEvent.RADIO}
+        return {NetworkEvent.CONNECTION_STATE}
+    return set()
+
+class ActivationWatcher:
+    """Reports activation stages from `nmcli device monitor` while a connect command runs.
+
+    nmcli itself only prints the outcome, so a second process follows the
+    device's state changes. Without a secret agent a secrets request after
+    we supplied the password, or a repeated one, means the credentials were
+    rejected; the watcher then disconnects the device so the connect command
+    fails at once instead of after NetworkManager's own timeout.
+    """
+
+    def __init__(self, device: str, on_state: Optional[ActivationCallback], password_given: bool):
+        self.device = device
+        self.failure: Optional[str] = None
+        self._on_state = on_state
+        self._password_given = password_given
+        self._process: Optional[subprocess.Popen] = None
+        self._reader: Optional[threading.Thread] = None
+        self._stopped = False
+
+    def start(self) -> None:
+        try:
+            self._process = subprocess.Popen(
+                ["nmcli", "device", "monitor", self.device],
+                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+                env=dict(os.environ, LC_ALL="C")  # the stage table expects English output
+            )
+        except OSError as e:
+            print(f"Could not follow activation progress: {e}")
+            return
+        self._reader = threading.Thread(target=self._read, name="nmcli-activation", daemon=True)
+        self._reader.start()
+
+    def stop(self) -> None:
+        """Stop following; no stage is reported from the monitor once this returns"""
+        self._stopped = True
+        if self._process is not None:
+            self._process.terminate()
+            self._process.wait()
+        if self._reader is not None:
+            self._reader.join()
+
+    def abort(self, reason: str) -> None:
+        """Fail the running connect command by disconnecting the device"""
+        self.failure = self.failure or reason
+        try:
+            _device.disconnect(self.device)
+        except (nmcli._exception.DisconnectDeviceFailedException, nmcli._exception.NotExistException,
+                nmcli._exception.UnspecifiedException) as e:
+            print(f"Error disconnecting {self.device}: {e}")
+
+    def report(self, state: ActivationState, reason: Optional[str] = None) -> None:
+        if self._on_state is not None:
+            self._on_state(state, reason)
+
+    def _read(self) -> None:
+        auth_requests = 0
+        for line in self._process.stdout:
+            # Lines still buffered when the connect command finished are stale
+            if self._stopped:
+                break
+            _device, _sep, state = line.strip().partition(": ")
+            stage = MONITOR_STAGES.get(state)
+            # FAILED and ACTIVATED are reported once the connect command returns
+            if stage is None or stage == ActivationState.FAILED:
+                continue
+            self.report(stage)
+            if stage == ActivationState.NEED_AUTH:
+                auth_requests += 1
+                if self._password_given or auth_requests > 1:
+                    self.abort("wrong password or missing secrets")
+
+class NmcliBackend(NetworkBackend):
+    """Backend that drives NetworkManager through the nmcli package"""
+
+    name = "nmcli"
+
+    WIFI_TYPES = ("wifi", "802-11-wireless")
+
+    def __init__(self):
+        self._wifi_device: Optional[str] = None
+        # Watcher of the connect command in progress, for cancel_activation()
+        self._watcher: Optional[ActivationWatcher] = None
+
+    def check_available(self) -> Tuple[bool, str]:
+        # Check if nmcli command is available
+        if not shutil.which("nmcli"):
+            return False, ("Error: NetworkManager is not installed or not available in PATH.\n"
+                           "Please install NetworkManager to use this application.")
+        
+        # Check if NetworkManager service is running
+        try:
+            result = _traced_run(
+                ["nmcli", "general", "status"],
+                capture_output=True,
+                text=True,
+                timeout=5
+            )
+            if result.returncode != 0:
+                return False, ("Error: NetworkManager is not running.\n"
+                               "Please start the NetworkManager service.")
+        except subprocess.TimeoutExpired:
+            return False, "Error: NetworkManager is not responding."
+        except Exception as e:
+            return False, f"Error: Could not check NetworkManager status: {e}"
+        
+        return True, "NetworkManager is running"
+
+    def get_wifi_enabled(self) -> bool:
+        return _radio.wifi()
+
+    def set_wifi_enabled(self, enabled: bool) -> None:
+        if enabled:
+            _radio.wifi_on()
+        else:
+            _radio.wifi_off()
+
+    def rescan(self, timeout: float) -> List[NetworkInfo]:
+        # nmcli enforces its own scan timeout, so timeout is not needed here
+        try:
+            wifi_list = NmcliExtensions.wifi_force_rescan(_device)
+        except nmcli._exception.ScanningNotAllowedException:
+            # A scan is running or has just finished, so current results are fresh
+            wifi_list = NmcliExtensions.wifi_list(_device)
+        return [NetworkInfo.from_wifi_device(wifi) for wifi in wifi_list]
+
+    def _find_ssids(self, ssids: List[str]) -> List[NetworkInfo]:
+        wifi_list = NmcliExtensions.wifi_list(_device, rescan=False)
+        return [NetworkInfo.from_wifi_device(wifi) for wifi in wifi_list if wifi.ssid in ssids]
+
+    def rescan_ssids(self, ssids: List[str], timeout: float) -> Tuple[List[NetworkInfo], bool]:
+        # nmcli can't tell when a scan finishes, and the list keeps every access
+        # point seen recently; a scan has landed once these SSIDs' entries change
+        before = self._find_ssids(ssids)
+        try:
+            NmcliExtensions.wifi_rescan_ssids(_device, ssids)
+        except nmcli._exception.ScanningNotAllowedException:
+            pass  # A scan is already running; its results will do
+        # `rescan` returns before the scan finishes, so re-read the list
+        # (without triggering a full scan) until it differs
+        deadline = time.monotonic() + timeout
+        while True:
+            time.sleep(RESCAN_POLL_INTERVAL)
+            found = self._find_ssids(ssids)
+            if found != before:
+                return found, True
+            if time.monotonic() >= deadline:
+                return found, False
+
+    def get_access_points(self) -> List[NetworkInfo]:
+        # --rescan no: nmcli would otherwise start a scan when its results are over 30 s old
+        wifi_list = NmcliExtensions.wifi_list(_device, rescan=False)
+        return [NetworkInfo.from_wifi_device(wifi) for wifi in wifi_list]
+
+    def get_saved_connections(self) -> List[SavedConnection]:
+        # Two nmcli calls however many profiles there are: list the WiFi ones, then show them all
+        uuids = NmcliExtensions.wifi_connection_uuids(_connection, self.WIFI_TYPES)
+        if not uuids:
+            return []
+
+        saved = []
+        for fields in NmcliExtensions.show_connections(_connection, uuids):
+            ssid = fields.get("802-11-wireless.ssid")
+            if not ssid:
+                continue
+            saved.append(SavedConnection(
+                name=fields.get("connection.id", ""),
+                uuid=fields.get("connection.uuid", ""),
+                ssid=ssid,
+                autoconnect_priority=_int_or_zero(fields.get("connection.autoconnect-priority")),
+                timestamp=_int_or_zero(fields.get("connection.timestamp"))
+            ))
+        return saved
+
+    def _find_wifi_device(self) -> str:
+        if self._wifi_device is None:
+            for device in _device.status():
+                if device.device_type == "wifi":
+                    self._wifi_device = device.device
+                    break
+            else:
+                raise ActivationFailedError("No WiFi device found")
+        return self._wifi_device
+
+    def _activate(self, name: str, command: Callable[[int], None], on_state: Optional[ActivationCallback],
+                  timeout: float, password_given: bool) -> None:
+        """Run a connect command with a deadline, following its progress"""
+        watcher = ActivationWatcher(self._find_wifi_device(), on_state, password_given)
+        self._watcher = watcher
+        watcher.start()
+        try:
+            # nmcli waits at most this long for the connection to come up
+            command(max(1, int(timeout)))
+        except nmcli._exception.TimeoutExpiredException as e:
+            watcher.abort(f"timed out after {timeout:g}s")
+            watcher.report(ActivationState.FAILED, watcher.failure)
+            raise ActivationFailedError(f"Connection activation failed for {name}: {watcher.failure}") from e
+        except nmcli._exception.ConnectionActivateFailedException as e:
+            reason = watcher.failure or str(e)
+            watcher.report(ActivationState.FAILED, reason)
+            raise ActivationFailedError(f"Connection activation failed for {name}: {reason}") from e
+        finally:
+            self._watcher = None
+            watcher.stop()
+        watcher.report(ActivationState.ACTIVATED)
+
+    def connect(self, ssid: str, password: Optional[str] = None,
+                on_state: Optional[ActivationCallback] = None,
+                timeout: float = ACTIVATION_TIMEOUT) -> None:
+        def command(wait: int) -> None:
+            if password:
+                _device.wifi_connect(ssid, password, wait=wait)
+            else:
+                NmcliExtensions.connect_to_open_or_saved_wifi(_device, ssid, wait=wait)
+        self._activate(ssid, command, on_state, timeout, password_given=bool(password))
+
+    def activate_connection(self, uuid: str, bssid: Optional[str] = None,
+                            on_state: Optional[ActivationCallback] = None,
+                            timeout: float = ACTIVATION_TIMEOUT) -> None:
+        def command(wait: int) -> None:
+            try:
+                NmcliExtensions.connection_up_uuid(_connection, uuid, bssid, wait=wait)
+            except nmcli._exception.NotExistException as e:
+                raise ConnectionNotFoundError(f"No such connection or access point: '{uuid}'") from e
+        self._activate(uuid, command, on_state, timeout, password_given=False)
+
+    def cancel_activation(self) -> None:
+        watcher = self._watcher
+        if watcher is not None:
+            watcher.abort("cancelled")
+
+    def disconnect(self, ssid: str) -> None:
+        _connection.down(ssid)
+
+    def delete_connections(self, uuids: List[str]) -> Dict[str, str]:
+        if not uuids:
+            return {}
+        deleted, errors = NmcliExtensions.delete_connections_uuid(_c_connection, uuids)
+        return {uuid: errors or "not deleted" for uuid in uuids if uuid not in deleted}
+
+    def start_monitor(self, callback: MonitorCallback) -> Callable[[], None]:
+        launcher = Gio.SubprocessLauncher.new(
+            Gio.SubprocessFlags.STDOUT_PIPE | Gio.SubprocessFlags.STDERR_SILENCE
+        )
+        # The line classifier expects English output; LC_ALL overrides the user's LC_MESSAGES too
+        launcher.setenv("LC_ALL", "C", True)
+        process = launcher.spawnv(["nmcli", "monitor"])
+        stream = Gio.DataInputStream.new(process.get_stdout_pipe())
+        cancellable = Gio.Cancellable()
+
+        def on_line(source, result):
+            try:
+                line, _length = source.read_line_finish_utf8(result)
+            except GLib.Error:
+                return  # cancelled by stop()
+            if line is None:
+                print("nmcli monitor exited")
+                return
+            events = events_from_monitor_line(line.strip())
+            if events:
+                callback(events)
+            source.read_line_async(GLib.PRIORITY_DEFAULT, cancellable, on_line)
+
+        stream.read_line_async(GLib.PRIORITY_DEFAULT, cancellable, on_line)
+
+        def stop():
+            cancellable.cancel()
+            process.force_exit()
+        return stop
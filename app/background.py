@@ -0,0 +1,215 @@
+"""Shared worker threads for running NetworkService calls off the UI thread"""
+
+import asyncio
+import queue
+import threading
+import time
+import weakref
+from concurrent.futures import Future
+from typing import Any, Callable, Optional, Set
+
+from gi.repository import GLib
+
+from profiler import Profiler, MAIN_LOOP, WORKER
+
+# Read-only queries may run side by side; mutating nmcli operations run one at a time
+READ_WORKERS = 4
+WRITE_WORKERS = 1
+
+class WorkerPool:
+    """Fixed-size pool of daemon threads feeding from a queue.
+
+    Daemon threads keep the app from hanging on exit while a long nmcli call
+    (e.g. a 90 s connection attempt) is still running.
+    """
+
+    def __init__(self, name: str, max_workers: int):
+        self._name = name
+        self._max_workers = max_workers
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._threads = []
+        self._lock = threading.Lock()
+
+    def submit(self, fn: Callable, *args) -> Future:
+        """Queue fn(*args) and return a future for its result"""
+        future: Future = Future()
+        self._queue.put((future, fn, args, time.perf_counter()))
+        self._start_workers()
+        return future
+
+    def _start_workers(self) -> None:
+        with self._lock:
+            while len(self._threads) < self._max_workers:
+                thread = threading.Thread(
+                    target=self._work, name=f"{self._name}-{len(self._threads)}", daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def _work(self) -> None:
+        while True:
+            future, fn, args, queued_at = self._queue.get()
+            if not future.set_running_or_notify_cancel():
+                continue  # cancelled while queued
+            queued_ms = round((time.perf_counter() - queued_at) * 1000, 3)
+            try:
+                with Profiler.span(_callable_name(fn), WORKER, queued_ms=queued_ms):
+                    result = fn(*args)
+                future.set_result(result)
+            except BaseException as e:
+                future.set_exception(e)
+
+def _callable_name(fn: Callable) -> str:
+    return getattr(fn, "__qualname__", None) or repr(fn)
+
+_read_pool = WorkerPool("nmgui-read", READ_WORKERS)
+_write_pool = WorkerPool("nmgui-write", WRITE_WORKERS)
+
+class Task:
+    """Handle on a background call whose result is delivered on the main loop.
+
+    A Task can also be awaited from a coroutine running on an asyncio loop
+    (e.g. PyGObject's GLib event loop policy); it resolves after the main-loop
+    callbacks have run and raises TimeoutError when the call timed out.
+    """
+
+    def __init__(self):
+        self.future: Optional[Future] = None
+        self.outcome: Future = Future()
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        """Drop the result; the call itself is skipped if it hasn't started yet"""
+        self.cancelled = True
+        if self.future is not None:
+            self.future.cancel()
+        self.outcome.cancel()
+
+    def __await__(self):
+        return asyncio.wrap_future(self.outcome).__await__()
+
+# Outstanding tasks per owning widget; only touched from the main thread
+_owned_tasks: "weakref.WeakKeyDictionary[Any, Set[Task]]" = weakref.WeakKeyDictionary()
+
+def _track(owner, task: Task) -> None:
+    if owner is None:
+        return
+    tasks = _owned_tasks.get(owner)
+    if tasks is None:
+        tasks = _owned_tasks[owner] = set()
+        # Leaving a view unrealizes it; anything it still waits for is stale
+        owner.connect("unrealize", lambda widget: cancel_owned_tasks(widget))
+    tasks.add(task)
+
+def _untrack(owner, task: Task) -> None:
+    if owner is not None and owner in _owned_tasks:
+        _owned_tasks[owner].discard(task)
+
+def cancel_owned_tasks(owner) -> None:
+    """Cancel every task requested by owner"""
+    tasks = _owned_tasks.get(owner)
+    if tasks:
+        for task in tasks:
+            task.cancel()
+        # Keep the entry: its unrealize handler is already connected
+        tasks.clear()
+
+def run_in_background(fn: Callable, *args, on_done: Optional[Callable] = None,
+                      on_error: Optional[Callable] = None, owner=None,
+                      mutating: bool = False, timeout: Optional[float] = None) -> Task:
+    """
+    Run fn(*args) on a shared worker and deliver the outcome on the main loop.
+
+    Args:
+        on_done: Called with the result on the main loop
+        on_error: Called with the exception on the main loop (printed if omitted)
+        owner: Widget the result belongs to; its tasks are cancelled when it is unrealized
+        mutating: Serialize with other mutating calls instead of running in parallel
+        timeout: Seconds to wait before giving up with a TimeoutError; a call
+            that already started keeps running, but its result is dropped
+
+    Must be called from the main thread when an owner is given.
+    """
+    task = Task()
+    pool = _write_pool if mutating else _read_pool
+
+    timeout_id = None
+
+    def finish(result=None, error: Optional[BaseException] = None):
+        nonlocal timeout_id
+        _untrack(owner, task)
+        if timeout_id is not None:
+            GLib.source_remove(timeout_id)
+            timeout_id = None
+
+        if error is not None:
+            if on_error is not None:
+                with Profiler.span(_callable_name(on_error), MAIN_LOOP):
+                    on_error(error)
+            else:
+                print(f"Background task failed: {error}")
+            task.outcome.set_exception(error)
+        else:
+            if on_done is not None:
+                with Profiler.span(_callable_name(on_done), MAIN_LOOP):
+                    on_done(result)
+            task.outcome.set_result(result)
+
+    def deliver(future: Future):
+        if task.cancelled or future.cancelled():
+            return False
+        error = future.exception()
+        finish(None if error else future.result(), error)
+        return False
+
+    def expire():
+        nonlocal timeout_id
+        timeout_id = None
+        if not task.cancelled and not task.outcome.done():
+            # Stop the worker result from being delivered, then report the timeout
+            task.cancelled = True
+            task.future.cancel()
+            finish(error=TimeoutError(f"Timed out after {timeout:g}s"))
+        return False
+
+    task.future = pool.submit(fn, *args)
+    _track(owner, task)
+    if timeout is not None:
+        timeout_id = GLib.timeout_add(int(timeout * 1000), expire)
+    task.future.add_done_callback(lambda future: GLib.idle_add(deliver, future))
+    return task
+
+def main_loop_callback(fn: Callable, owner=None, repeating: bool = False) -> Callable:
+    """Wrap fn so it can be called from any thread and runs on the main loop.
+
+    The call is dropped if owner has been unrealized in the meantime. A
+    repeating callback (e.g. for progress reports) stays registered with
+    owner across calls; call its release() from any thread after the last
+    call to unregister it, which also drops anything called after that.
+    Must be called from the main thread when an owner is given.
+    """
+    task = Task()
+    _track(owner, task)
+
+    def deliver(args):
+        if not repeating:
+            _untrack(owner, task)
+        if not task.cancelled:
+            with Profiler.span(_callable_name(fn), MAIN_LOOP):
+                fn(*args)
+        return False
+
+    def release():
+        # Queued behind the calls already made, so those are still delivered
+        GLib.idle_add(finish)
+
+    def finish():
+        _untrack(owner, task)
+        task.cancelled = True
+        return False
+
+    def call(*args):
+        GLib.idle_add(deliver, args)
+
+    call.release = release
+    return call
@@ -1,28 +1,17 @@
 #!/usr/bin/env python3
-import gi
+import time
+
+_START_TIME = time.perf_counter()
+
 import argparse
+import os
 import sys
-from network_service import NetworkService
-from ui.main_window import NetworkManagerWindow
-gi.require_version("Gtk", "4.0")
-from gi.repository import Gtk
-from ui.styles import StyleManager
+from backends import BACKEND_NAMES
+from startup_trace import StartupTrace
 
 # Application version
 __version__ = "1.0.0"
 
-class NetworkManagerApp(Gtk.Application):
-    """Main application class"""
-    
-    def __init__(self):
-        super().__init__(application_id="com.network.manager")
-    
-    def do_activate(self):
-        """Application activation"""
-        StyleManager.apply_styles()
-        win = NetworkManagerWindow(self)
-        win.present()
-
 def parse_arguments():
     """Parse command line arguments"""
     parser = argparse.ArgumentParser(
@@ -36,22 +25,70 @@ def parse_arguments():
         version=f"%(prog)s {__version__}"
     )
     
+    parser.add_argument(
+        "--backend",
+        choices=BACKEND_NAMES,
+        default=os.environ.get("NMGUI_BACKEND") or "auto",
+        help="How to talk to NetworkManager: D-Bus, the nmcli tool, or auto-detect (default: auto)"
+    )
+    
+    parser.add_argument(
+        "--detect-stalls",
+        action="store_true",
+        help="Log main-loop handlers that block the UI for more than 16 ms"
+    )
+    
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="nmgui-trace.json",
+        metavar="PATH",
+        help="Record timings and write them as a Chrome trace on exit "
+             "(default: nmgui-trace.json); press F12 in the app for a live overlay"
+    )
+    
+    parser.add_argument(
+        "--startup-trace",
+        action="store_true",
+        help="Print how long each startup phase takes"
+    )
+    
     return parser.parse_args()
 
+def run(args) -> int:
+    """Start the GTK application; returns the process exit status"""
+    # GTK and the UI are only loaded once we know the app will actually start
+    from application import NetworkManagerApp
+    from network_service import NetworkService
+    from stall_detector import StallDetector
+    from profiler import Profiler
+    StartupTrace.mark("modules imported")
+    
+    if args.profile:
+        Profiler.enable()
+    
+    NetworkService.use_backend(args.backend)
+    
+    if args.detect_stalls:
+        StallDetector().start()
+    
+    # NetworkManager availability is checked by the window, alongside the first scan
+    app = NetworkManagerApp()
+    try:
+        app.run()
+    finally:
+        if args.profile:
+            Profiler.dump(args.profile)
+    return app.exit_status
+
 if __name__ == "__main__":
     try:
         # Parse command line arguments first
         args = parse_arguments()
+        if args.startup_trace:
+            StartupTrace.enable(_START_TIME)
+        StartupTrace.mark("arguments parsed")
         
-        # Check if NetworkManager is available before starting the app
-        if not NetworkService.check_networkmanager():
-            sys.exit(1)
-        
-        # If we get here, NetworkManager is available, so start the app
-        app = NetworkManagerApp()
-        app.run()
+        sys.exit(run(args))
     except KeyboardInterrupt:
         print("Application stopped manually.")
-    except SystemExit:
-        # argparse calls sys.exit() for version/help, let it pass through
-        pass
@@ -1,8 +1,8 @@
 """Data models for the network manager application"""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
 from enum import Enum
-from typing import Optional
+from typing import Dict, List, NamedTuple, Optional
 
 class WiFiState(Enum):
     """Enum for WiFi states"""
@@ -11,6 +11,30 @@ class WiFiState(Enum):
     SCANNING = "scanning"
     CONNECTING = "connecting"
 
+class NetworkEvent(Enum):
+    """Kinds of change NetworkManager reports while the app is running"""
+    ACCESS_POINTS = "access-points"
+    SIGNAL = "signal"
+    CONNECTION_STATE = "connection-state"
+    RADIO = "radio"
+    SAVED_CONNECTIONS = "saved-connections"
+
+class ActivationState(Enum):
+    """Stages a connection goes through while NetworkManager activates it"""
+    PREPARING = "preparing"
+    CONFIGURING = "config"
+    NEED_AUTH = "need-auth"
+    IP_CONFIG = "ip-config"
+    IP_CHECK = "ip-check"
+    ACTIVATED = "activated"
+    FAILED = "failed"
+
+class ConnectResult(NamedTuple):
+    """Outcome of a connection attempt; unpacks like the (success, message) results of other operations"""
+    success: bool
+    message: str
+    cancelled: bool = False
+
 @dataclass
 class NetworkInfo:
     """Data class for network information"""
@@ -24,6 +48,57 @@ class NetworkInfo:
     rate: Optional[int] = None
     mode: Optional[str] = None
     security: Optional[str] = None
+    # Every access point (BSSID) broadcasting this SSID, best first; empty for a single AP entry
+    access_points: List["NetworkInfo"] = field(default_factory=list)
+    # Saved profile joined in by NetworkService; is_saved is None when that wasn't possible
+    is_saved: Optional[bool] = None
+    profile_uuid: Optional[str] = None
+    autoconnect_priority: Optional[int] = None
+    last_connected: Optional[int] = None  # Unix time, None if never connected
+    
+    @property
+    def band(self) -> Optional[str]:
+        """Frequency band label such as "5 GHz" """
+        if not self.frequency:
+            return None
+        if self.frequency >= 5925:
+            return "6 GHz"
+        if self.frequency >= 5000:
+            return "5 GHz"
+        return "2.4 GHz"
+    
+    def _preference(self):
+        """Sort key for picking the AP we'd associate with: in use, then signal with a 5/6 GHz bonus"""
+        band_bonus = 10 if self.frequency and self.frequency >= 5000 else 0
+        return (self.is_connected, self.signal + band_bonus)
+    
+    @classmethod
+    def group_by_ssid(cls, access_points: List["NetworkInfo"]) -> List["NetworkInfo"]:
+        """Merge per-BSSID entries into one entry per SSID, based on its best access point"""
+        by_ssid: Dict[str, List[NetworkInfo]] = {}
+        for ap in access_points:
+            by_ssid.setdefault(ap.ssid, []).append(ap)
+        
+        networks = []
+        for aps in by_ssid.values():
+            aps = sorted(aps, key=lambda ap: ap._preference(), reverse=True)
+            best = aps[0]
+            
+            # Aggregate security keeps every mode seen on any AP, in first-seen order
+            security_modes: List[str] = []
+            for ap in aps:
+                for mode in (ap.security or "").split():
+                    if mode not in security_modes:
+                        security_modes.append(mode)
+            
+            networks.append(replace(
+                best,
+                requires_password=any(ap.requires_password for ap in aps),
+                is_connected=any(ap.is_connected for ap in aps),
+                security=" ".join(security_modes) or best.security,
+                access_points=aps
+            ))
+        return networks
     
     @classmethod
     def from_wifi_device(cls, wifi_device):
@@ -40,3 +115,17 @@ class NetworkInfo:
             mode=wifi_device.mode,
             security=wifi_device.security
         )
+
+@dataclass(frozen=True)
+class SavedConnection:
+    """Data class for a saved WiFi connection profile"""
+    name: str
+    uuid: str
+    ssid: str
+    autoconnect_priority: int = 0
+    # Unix time of the last successful activation, 0 if never
+    timestamp: int = 0
+    
+    def preference(self):
+        """Sort key for picking the profile NetworkManager would autoconnect first"""
+        return (self.autoconnect_priority, self.timestamp)
@@ -1,71 +1,357 @@
 import os
-import re
 import time
-import nmcli
-import subprocess
-import shutil
-from typing import List, Tuple, Optional
+import threading
+from dataclasses import replace
+from typing import Any, Callable, Dict, Iterable, List, Set, Tuple, Optional
 
 # Import the new NetworkInfo model from models
-from models import NetworkInfo
+from models import ActivationState, ConnectResult, NetworkEvent, NetworkInfo, SavedConnection
+from backends import (NetworkBackend, ActivationFailedError, ConnectionNotFoundError,
+                      ACTIVATION_TIMEOUT, create_backend)
+from background import Task, main_loop_callback, run_in_background
+from snapshot import ScanSnapshot
+from profiler import Profiler
 
-nmcli.disable_use_sudo()
-nmcli.set_lang(os.environ.get("LANG") or "C.UTF-8")
+# Keys of the read queries shared through QueryCache
+WIFI_ENABLED = "wifi-enabled"
+ACCESS_POINTS = "access-points"
+SAVED_CONNECTIONS = "saved-connections"
+
+# Cached queries made stale by each kind of NetworkManager change
+EVENT_QUERIES = {
+    NetworkEvent.ACCESS_POINTS: (ACCESS_POINTS,),
+    # Signal changes leave the scan index's age alone; see invalidate_for_events
+    NetworkEvent.SIGNAL: (ACCESS_POINTS,),
+    NetworkEvent.CONNECTION_STATE: (ACCESS_POINTS,),
+    NetworkEvent.RADIO: (WIFI_ENABLED, ACCESS_POINTS),
+    NetworkEvent.SAVED_CONNECTIONS: (SAVED_CONNECTIONS,),
+}
+
+class _Flight:
+    """One in-progress query that concurrent callers wait on"""
+
+    def __init__(self, generation: int):
+        self.generation = generation
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+class QueryCache:
+    """Single-flight, short-lived memoization of backend read queries.
+
+    Callers asking for a key while it is being loaded wait for that load
+    instead of starting their own; the result is then reused for ttl seconds.
+    Invalidating a key drops its result and detaches any load in progress,
+    so later callers never see data from before the invalidation.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._results: Dict[str, Tuple[Any, float]] = {}
+        self._flights: Dict[str, _Flight] = {}
+        self._generations: Dict[str, int] = {}
+
+    def get(self, key: str, loader: Callable[[], Any], memoize: bool = True) -> Any:
+        """Return the memoized value for key, loading it at most once at a time.
+
+        With memoize=False concurrent callers still share one load, but its
+        result is not kept for later ones.
+        """
+        with self._lock:
+            cached = self._results.get(key)
+            if cached is not None and time.monotonic() - cached[1] <= self.ttl:
+                return cached[0]
+            flight = self._flights.get(key)
+            owner = flight is None
+            if owner:
+                flight = self._flights[key] = _Flight(self._generations.get(key, 0))
+
+        if not owner:
+            flight.done.wait()
+        else:
+            try:
+                flight.result = loader()
+            except BaseException as e:
+                flight.error = e
+            with self._lock:
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+                if (memoize and flight.error is None
+                        and flight.generation == self._generations.get(key, 0)):
+                    self._results[key] = (flight.result, time.monotonic())
+            flight.done.set()
+
+        if flight.error is not None:
+            raise flight.error
+        return flight.result
+
+    def put(self, key: str, value: Any) -> None:
+        """Store a value obtained outside get() (e.g. by a rescan)"""
+        with self._lock:
+            self._results[key] = (value, time.monotonic())
+
+    def invalidate(self, *keys: str) -> None:
+        """Forget the given keys (all keys if none are given)"""
+        with self._lock:
+            for key in keys or set(self._results) | set(self._flights):
+                self._results.pop(key, None)
+                self._flights.pop(key, None)
+                self._generations[key] = self._generations.get(key, 0) + 1
+
+class SavedConnectionCache:
+    """In-memory SSID index of saved WiFi profiles, built with one bulk query"""
+
+    def __init__(self, loader: Callable[[], List[SavedConnection]]):
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._by_ssid: Optional[Dict[str, List[SavedConnection]]] = None
+        self._generation = 0
+
+    def invalidate(self) -> None:
+        """Drop the index so the next lookup rebuilds it"""
+        with self._lock:
+            self._by_ssid = None
+            self._generation += 1
+
+    def get(self, ssid: str) -> List[SavedConnection]:
+        """Return the saved profiles for an SSID (empty if none)"""
+        return self._index().get(ssid, [])
+
+    def contains(self, ssid: str) -> bool:
+        """Check whether any saved profile uses this SSID"""
+        return ssid in self._index()
+
+    def profiles(self) -> List[SavedConnection]:
+        """Return every saved WiFi profile"""
+        return [saved for profiles in self._index().values() for saved in profiles]
+
+    def discard(self, uuids: Set[str]) -> None:
+        """Drop deleted profiles from the index without rebuilding it"""
+        with self._lock:
+            # Anything being built right now may still contain them
+            self._generation += 1
+            if self._by_ssid is None:
+                return
+            index: Dict[str, List[SavedConnection]] = {}
+            for ssid, profiles in self._by_ssid.items():
+                kept = [saved for saved in profiles if saved.uuid not in uuids]
+                if kept:
+                    index[ssid] = kept
+            self._by_ssid = index
+
+    def seed(self, saved_connections: List[SavedConnection]) -> None:
+        """Use a previously saved profile list until reload() replaces it"""
+        with self._lock:
+            if self._by_ssid is None:
+                self._by_ssid = self._build(saved_connections)
+
+    def reload(self) -> None:
+        """Rebuild the index, keeping the current one in use until the new one is ready"""
+        with self._lock:
+            generation = self._generation
+        self._publish(generation, self._build(self._loader()))
+
+    def _index(self) -> Dict[str, List[SavedConnection]]:
+        with self._lock:
+            if self._by_ssid is not None:
+                return self._by_ssid
+            generation = self._generation
+
+        index = self._build(self._loader())
+        self._publish(generation, index)
+        return index
+
+    def _publish(self, generation: int, index: Dict[str, List[SavedConnection]]) -> None:
+        with self._lock:
+            # Only publish if nothing invalidated the index while we were building
+            if generation == self._generation:
+                self._by_ssid = index
 
-class NmcliExtensions:
-    """Extended functionalities for nmcli package"""
-    
-    @staticmethod
-    def connect_to_open_or_saved_wifi(device_control_instance, ssid: str) -> None:
-        """Connect to a known WiFi network without requiring password"""
-        cmd =  ['device', 'wifi', 'connect', ssid]
-                
-        try:
-            result = device_control_instance._syscmd.nmcli(cmd)
-            
-            failure_patterns = [
-                r'Connection activation failed:',
-                r'Error: Connection activation failed',
-                r'Error: No network with SSID',
-                r'Error: Failed to add/activate new connection'
-            ]
-            
-            for pattern in failure_patterns:
-                if re.search(pattern, result):
-                    raise nmcli._exception.ConnectionActivateFailedException(
-                        f'Connection activation failed for {ssid}'
-                    )
-            
-            print(f"Successfully connected to {ssid}")
-            
-        except nmcli._exception.ConnectionActivateFailedException:
-            raise
-        except Exception as e:
-            print(f"Failed to connect to {ssid}: {e}")
-            raise
-    
     @staticmethod
-    def wifi_force_rescan(device_control_instance) -> bool:
-        """Force a WiFi rescan to refresh available networks"""
-        cmd = ['device', 'wifi', 'list', '--rescan', 'yes']
-        
-                
-        try:
-            device_control_instance._syscmd.nmcli(cmd)
-            print("WiFi rescan completed successfully")
-            return True
-        except Exception as e:
-            print(f"WiFi rescan failed: {e}")
-            raise
+    def _build(saved_connections: List[SavedConnection]) -> Dict[str, List[SavedConnection]]:
+        index: Dict[str, List[SavedConnection]] = {}
+        for saved in saved_connections:
+            index.setdefault(saved.ssid, []).append(saved)
+        return index
+
+class ScanCache:
+    """Last scan result with stale-while-revalidate refreshing.
+
+    Alongside the list it keeps an SSID index of the grouped networks, each
+    entry stamped with when it was last refreshed, so single networks can
+    be looked up and updated in place.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._networks: Optional[List[NetworkInfo]] = None
+        self._updated = 0.0
+        self._by_ssid: Dict[str, Tuple[NetworkInfo, float]] = {}
+        self._waiters: List[Callable[[List[NetworkInfo]], None]] = []
+
+    def store(self, networks: List[NetworkInfo], stale: bool = False, keep_age: bool = False) -> None:
+        """Remember a scan result; stale results are served but always revalidated.
+
+        With keep_age the networks replace the cached ones (e.g. with new
+        signal strengths) but networks already known keep their age, since
+        no scan ran to make them any fresher.
+        """
+        updated = float("-inf") if stale else time.monotonic()
+        with self._lock:
+            ages = {ssid: age for ssid, (_, age) in self._by_ssid.items()} if keep_age else {}
+            if not keep_age or self._networks is None:
+                self._updated = updated
+            self._networks = list(networks)
+            self._by_ssid = {network.ssid: (network, ages.get(network.ssid, updated)) for network in networks}
+
+    def update(self, network: NetworkInfo, keep_age: bool = False) -> None:
+        """Replace a single network (found by SSID) with fresher data, adding it if it is new.
+
+        With keep_age the data is not known to come from a finished scan,
+        so the entry keeps its age (and a new one counts as stale).
+        """
+        with self._lock:
+            updated = time.monotonic()
+            if keep_age:
+                _, updated = self._by_ssid.get(network.ssid, (None, float("-inf")))
+            if self._networks is not None:
+                if network.ssid in self._by_ssid:
+                    self._networks = [network if cached.ssid == network.ssid else cached
+                                      for cached in self._networks]
+                else:
+                    self._networks.append(network)
+            self._by_ssid[network.ssid] = (network, updated)
+
+    def expire(self) -> None:
+        """Keep the cached networks for display but force the next lookup to refresh"""
+        with self._lock:
+            self._updated = float("-inf")
+            self._by_ssid = {ssid: (network, float("-inf")) for ssid, (network, _) in self._by_ssid.items()}
+
+    def lookup(self, ssid: str) -> Tuple[Optional[NetworkInfo], float]:
+        """Return the cached network for an SSID (None if unknown) and its age in seconds"""
+        with self._lock:
+            entry = self._by_ssid.get(ssid)
+            if entry is None:
+                return None, float("inf")
+            network, updated = entry
+            return network, time.monotonic() - updated
+
+    def clear(self) -> None:
+        with self._lock:
+            self._networks = None
+            self._by_ssid = {}
+
+    def get(self) -> Tuple[Optional[List[NetworkInfo]], float]:
+        """Return the cached networks (None if empty) and their age in seconds"""
+        with self._lock:
+            if self._networks is None:
+                return None, float("inf")
+            return list(self._networks), time.monotonic() - self._updated
+
+    def revalidate(self, loader: Callable[[], List[NetworkInfo]],
+                   on_refreshed: Callable[[List[NetworkInfo]], None]) -> None:
+        """Run loader in the background once, handing the result to every waiter"""
+        with self._lock:
+            self._waiters.append(on_refreshed)
+            if len(self._waiters) > 1:
+                return  # a refresh is already running
+
+        def revalidate_job():
+            networks = loader()
+            with self._lock:
+                waiters, self._waiters = self._waiters, []
+            for waiter in waiters:
+                waiter(networks)
+
+        run_in_background(revalidate_job)
+
+_backend: Optional[NetworkBackend] = None
+_backend_name: Optional[str] = None
+_backend_lock = threading.Lock()
+
+_queries = QueryCache(ttl=float(os.environ.get("NMGUI_QUERY_TTL", "2.0")))
+_saved_connections = SavedConnectionCache(
+    lambda: _queries.get(SAVED_CONNECTIONS, NetworkService.backend().get_saved_connections)
+)
+_scan_cache = ScanCache()
+
+# Connection attempts currently running on worker threads
+_connecting = 0
+_connecting_lock = threading.Lock()
+# Set by cancel_connect() for the attempt in progress
+_connect_cancelled = threading.Event()
+
+ProgressCallback = Callable[[ActivationState, Optional[str]], None]
 
 class NetworkService:
     """Service class to handle network operations"""
+
+    # Scan results younger than this are served without a background rescan
+    SCAN_CACHE_TTL = 30.0
+    # Upper bound on waiting for the device to report a finished rescan
+    SCAN_TIMEOUT = 10.0
+    # Default deadline for quick queries made through the async API
+    QUERY_TIMEOUT = 10.0
+    # Scan data younger than this is shown on the details page without querying again
+    DETAILS_MAX_AGE = 10.0
+    # Deadline for a directed scan of a single network
+    TARGETED_SCAN_TIMEOUT = 5.0
+    # Seconds a connection attempt may take before it is abandoned
+    CONNECT_TIMEOUT = float(os.environ.get("NMGUI_CONNECT_TIMEOUT") or ACTIVATION_TIMEOUT)
+
+    @staticmethod
+    def use_backend(name: str) -> None:
+        """Select the backend ("auto", "dbus" or "nmcli") used by all operations.
+        
+        The backend is created on first use, so selecting it costs nothing at startup.
+        """
+        global _backend, _backend_name
+        with _backend_lock:
+            _backend = None
+            _backend_name = name
+        _queries.invalidate()
+        _saved_connections.invalidate()
+        _scan_cache.clear()
+
+    @staticmethod
+    def backend() -> NetworkBackend:
+        """Return the active backend, creating it on first use"""
+        global _backend
+        with _backend_lock:
+            if _backend is None:
+                backend = create_backend(_backend_name or os.environ.get("NMGUI_BACKEND") or "auto")
+                print(f"Using {backend.name} backend")
+                # With --profile every backend operation is timed
+                _backend = Profiler.wrap(backend) if Profiler.is_enabled() else backend
+            return _backend
     
+    @staticmethod
+    def restore_snapshot() -> bool:
+        """
+        Load the scan saved by the previous run so the list can be drawn before scanning.
+        
+        The restored networks are served as stale, so the first cached read
+        rescans, and saved profiles are reloaded in the background.
+        
+        Returns:
+            True if a snapshot was restored
+        """
+        snapshot = ScanSnapshot.load()
+        if snapshot is None:
+            return False
+        
+        _scan_cache.store(snapshot.networks, stale=True)
+        _saved_connections.seed(snapshot.saved_connections)
+        run_in_background(_saved_connections.reload)
+        return True
+
     @staticmethod
     def get_wifi_status() -> bool:
         """Check Wi-Fi status"""
         try:
-            return nmcli.radio.wifi()
+            return _queries.get(WIFI_ENABLED, NetworkService.backend().get_wifi_enabled)
         except Exception as e:
             print(f"Error getting Wi-Fi status: {e}")
             return False
@@ -74,14 +360,17 @@ class NetworkService:
     def toggle_wifi(state: bool) -> bool:
         """Enable or disable Wi-Fi"""
         try:
-            current_state = nmcli.radio.wifi()
+            backend = NetworkService.backend()
+            current_state = backend.get_wifi_enabled()
             if current_state == state:
                 return True
             
-            if state:
-                nmcli.radio.wifi_on()
-            else:
-                nmcli.radio.wifi_off()
+            try:
+                backend.set_wifi_enabled(state)
+            finally:
+                _queries.invalidate(WIFI_ENABLED, ACCESS_POINTS)
+            if not state:
+                _scan_cache.clear()
             return True
         except Exception as e:
             print(f"Error toggling Wi-Fi: {e}")
@@ -89,42 +378,118 @@ class NetworkService:
     
     @staticmethod
     def scan_networks(force_rescan: bool = True) -> List[NetworkInfo]:
-        """Scan for available networks with optional force rescan"""
+        """Scan for available networks with optional force rescan.
+        
+        A failed rescan returns an empty list; without force_rescan the error is raised.
+        """
         networks = []
         try:
+            backend = NetworkService.backend()
             if force_rescan:
-                NmcliExtensions.wifi_force_rescan(nmcli.device)
-                time.sleep(0.5)  # Allow rescan to complete
+                access_points = NetworkService._rescan(backend)
+            else:
+                access_points = _queries.get(ACCESS_POINTS, backend.get_access_points)
             
-            for wifi in nmcli.device.wifi():
-                if not wifi.ssid:
-                    continue
-                
-                # Use the new NetworkInfo.from_wifi_device method
-                network = NetworkInfo.from_wifi_device(wifi)
-                networks.append(network)
+            # One entry per SSID, holding all of its access points, with its saved profile attached
+            networks = NetworkService._join_saved(NetworkInfo.group_by_ssid(
+                [network for network in access_points if network.ssid]
+            ))
                 
+            # Reading NetworkManager's current results only refreshes what is already known
+            _scan_cache.store(networks, keep_age=not force_rescan)
             print(f"Found {len(networks)} networks")
             
+            # Only full scans are worth keeping for the next startup; scheduled
+            # refreshes come every few seconds and mostly move signal strengths
+            if force_rescan:
+                NetworkService._save_snapshot(networks)
+            
         except Exception as e:
+            if not force_rescan:
+                # Callers refreshing a list keep what they show rather than emptying it
+                raise
             print(f"Error scanning networks: {e}")
         
         return networks
 
+    @staticmethod
+    def _save_snapshot(networks: List[NetworkInfo]) -> None:
+        """Persist a scan result for the next startup"""
+        try:
+            saved_connections = _saved_connections.profiles()
+        except Exception as e:
+            print(f"Error loading saved connections for the snapshot: {e}")
+            saved_connections = []
+        ScanSnapshot(networks, saved_connections).save()
+
+    @staticmethod
+    def _rescan(backend: NetworkBackend) -> List[NetworkInfo]:
+        """Rescan, sharing one scan between concurrent callers, and remember the results"""
+        def rescan():
+            access_points = backend.rescan(NetworkService.SCAN_TIMEOUT)
+            _queries.put(ACCESS_POINTS, access_points)
+            return access_points
+        
+        # A finished rescan is only shared with callers that were waiting on it
+        return _queries.get("rescan", rescan, memoize=False)
+
+    @staticmethod
+    def scan_networks_cached(on_refreshed: Callable[[List[NetworkInfo]], None],
+                             max_age: Optional[float] = None) -> Tuple[Optional[List[NetworkInfo]], bool]:
+        """
+        Return the last scan result immediately, rescanning in the background if it is stale.
+        
+        Args:
+            on_refreshed: Called from a worker thread with the new list when a rescan ran
+            max_age: Freshness window in seconds (defaults to SCAN_CACHE_TTL)
+            
+        Returns:
+            Tuple of (networks, revalidating)
+            Where networks is None when nothing has been scanned yet,
+            and revalidating tells whether on_refreshed will be called
+        """
+        if max_age is None:
+            max_age = NetworkService.SCAN_CACHE_TTL
+        
+        networks, age = _scan_cache.get()
+        if networks is not None and age <= max_age:
+            return networks, False
+        
+        _scan_cache.revalidate(lambda: NetworkService.scan_networks(force_rescan=True), on_refreshed)
+        return networks, True
+
     @staticmethod
     def is_wifi_known(ssid: str) -> bool:
         """Check if WiFi network is already known/saved"""
         try:
-            connections = nmcli.connection()
-            return any(
-                nmcli.connection.show(conn.uuid).get("802-11-wireless.ssid") != None
-                and nmcli.connection.show(conn.uuid).get("802-11-wireless.ssid") == ssid
-                for conn in connections
-            )
+            return _saved_connections.contains(ssid)
         except Exception as e:
             print(f"Error checking known networks: {e}")
             return False
 
+    @staticmethod
+    def invalidate_saved_connections() -> None:
+        """Mark the saved-connection index stale after profiles were added, removed or modified"""
+        _queries.invalidate(SAVED_CONNECTIONS)
+        _saved_connections.invalidate()
+
+    @staticmethod
+    def invalidate_for_events(events: Iterable[NetworkEvent]) -> None:
+        """Drop cached query results made stale by the given NetworkManager changes"""
+        keys: Set[str] = set()
+        for event in events:
+            keys.update(EVENT_QUERIES.get(event, ()))
+        if SAVED_CONNECTIONS in keys:
+            NetworkService.invalidate_saved_connections()
+            keys.discard(SAVED_CONNECTIONS)
+        # Strength updates arrive every few seconds; they are picked up by the
+        # next list refresh without making the scan index look stale
+        if any(ACCESS_POINTS in EVENT_QUERIES.get(event, ()) for event in events
+               if event != NetworkEvent.SIGNAL):
+            _scan_cache.expire()
+        if keys:
+            _queries.invalidate(*keys)
+
     @staticmethod
     def forget_wifi(ssid: str) -> Tuple[bool, str]:
         """
@@ -138,98 +503,396 @@ class NetworkService:
             Where success indicates if the operation was successful,
             and message provides details about the result or error
         """
+        return NetworkService.forget_networks([ssid])[ssid]
+    
+    @staticmethod
+    def forget_networks(ssids: Iterable[str]) -> Dict[str, Tuple[bool, str]]:
+        """
+        Forget several saved WiFi networks at once.
+        
+        Every profile of every SSID is looked up in the saved-connection
+        index and all of them are deleted by UUID in one backend call, whose
+        result tells which deletions succeeded.
+        
+        Args:
+            ssids: The SSIDs of the networks to forget
+            
+        Returns:
+            Dict mapping each SSID to (success: bool, message: str)
+        """
+        ssids = list(dict.fromkeys(ssids))
+        results: Dict[str, Tuple[bool, str]] = {}
         try:
-            # First check if the network exists in known connections
-            if not NetworkService.is_wifi_known(ssid):
-                return False, f"No saved network found with SSID: '{ssid}'"
+            profiles = {ssid: _saved_connections.get(ssid) for ssid in ssids}
+            uuids = [saved.uuid for ssid in ssids for saved in profiles[ssid]]
             
-            # Try to delete the connection
             try:
-                nmcli.connection.delete(ssid)
-                
-                # Verify deletion was successful
-                if NetworkService.is_wifi_known(ssid):
-                    return False, f"Failed to forget network '{ssid}' - still exists after deletion"
-                    
-                return True, f"Successfully forgot network: '{ssid}'"
-                
-            except nmcli._exception.ConnectionDeleteException as e:
-                # Handle specific nmcli deletion errors
-                error_msg = str(e).strip()
-                if "no such connection" in error_msg.lower():
-                    return False, f"No saved network found with SSID: '{ssid}'"
-                return False, f"Failed to forget network '{ssid}': {error_msg}"
-                
+                failed = NetworkService.backend().delete_connections(uuids)
+            finally:
+                # Whatever the outcome, the memoized profile list is out of date
+                _queries.invalidate(SAVED_CONNECTIONS)
+            _saved_connections.discard({uuid for uuid in uuids if uuid not in failed})
+            
+            for ssid in ssids:
+                if not profiles[ssid]:
+                    results[ssid] = (False, f"No saved network found with SSID: '{ssid}'")
+                    continue
+                errors = [failed[saved.uuid] for saved in profiles[ssid] if saved.uuid in failed]
+                if errors:
+                    results[ssid] = (False, f"Failed to forget network '{ssid}': {errors[0]}")
+                else:
+                    results[ssid] = (True, f"Successfully forgot network: '{ssid}'")
+            
         except Exception as e:
-            error_msg = f"Unexpected error forgetting network '{ssid}': {str(e)}"
-            print(error_msg)
-            return False, error_msg
+            NetworkService.invalidate_saved_connections()
+            for ssid in ssids:
+                error_msg = f"Unexpected error forgetting network '{ssid}': {str(e)}"
+                print(error_msg)
+                results[ssid] = (False, error_msg)
+        
+        forgotten = sum(success for success, _ in results.values())
+        if len(ssids) > 1:
+            print(f"Forgot {forgotten} of {len(ssids)} networks")
+        return results
     
     @staticmethod
-    def connect_to_network(ssid: str, password: Optional[str] = None) -> Tuple[bool, str]:
-        """Connect to a network using improved connection method"""
+    def connect_to_network(ssid: str, password: Optional[str] = None,
+                           on_progress: Optional[ProgressCallback] = None,
+                           timeout: Optional[float] = None) -> ConnectResult:
+        """
+        Connect to a network.
+        
+        Without a password, a network with a saved profile is brought up by
+        the profile's UUID, which skips NetworkManager's SSID lookup and
+        profile matching. Otherwise (or if the profile has gone) it connects
+        by SSID, creating a profile when needed.
+        
+        Activation stages are passed to on_progress as they happen. The whole
+        attempt gives up after timeout seconds (CONNECT_TIMEOUT by default),
+        and can be abandoned from another thread with cancel_connect().
+        """
+        global _connecting
+        with _connecting_lock:
+            _connecting += 1
+            _connect_cancelled.clear()
+        deadline = time.monotonic() + (timeout or NetworkService.CONNECT_TIMEOUT)
+        by_ssid = False
         try:
-            if password:
-                nmcli.device.wifi_connect(ssid, password)
-            else:
-                NmcliExtensions.connect_to_open_or_saved_wifi(nmcli.device, ssid)
+            saved = None if password else NetworkService._saved_profile(ssid)
+            if saved is not None:
+                try:
+                    NetworkService._activate_saved(saved, on_progress, deadline)
+                    return ConnectResult(True, "Connected successfully")
+                except ConnectionNotFoundError as e:
+                    print(f"Saved profile for {ssid} is gone, connecting by SSID: {e}")
             
-            return True, "Connected successfully"
+            by_ssid = True
+            NetworkService._probe(ssid)
+            NetworkService._check_attempt(deadline)
+            NetworkService.backend().connect(ssid, password, on_progress, deadline - time.monotonic())
+            return ConnectResult(True, "Connected successfully")
             
-        except nmcli._exception.ConnectionActivateFailedException as e:
-            return False, f"Connection activation failed: {str(e)}"
+        except ActivationFailedError as e:
+            if _connect_cancelled.is_set():
+                return ConnectResult(False, "Connection cancelled", cancelled=True)
+            return ConnectResult(False, f"Connection activation failed: {str(e)}")
         except Exception as e:
-            return False, f"Connection error: {str(e)}"
+            return ConnectResult(False, f"Connection error: {str(e)}")
+        finally:
+            with _connecting_lock:
+                _connecting -= 1
+            if by_ssid:
+                # Connecting by SSID may create a new profile (or drop one after a failed attempt)
+                NetworkService.invalidate_saved_connections()
+            _queries.invalidate(ACCESS_POINTS)
+            _scan_cache.expire()
+
+    @staticmethod
+    def _saved_profile(ssid: str) -> Optional[SavedConnection]:
+        """The saved profile to activate for an SSID, if there is one"""
+        try:
+            profiles = _saved_connections.get(ssid)
+        except Exception as e:
+            print(f"Error looking up saved profiles for {ssid}: {e}")
+            return None
+        return max(profiles, key=lambda saved: saved.preference()) if profiles else None
+
+    @staticmethod
+    def _activate_saved(saved: SavedConnection, on_progress: Optional[ProgressCallback],
+                        deadline: float) -> None:
+        """Activate a saved profile, on the best access point of a recent scan when there is one"""
+        backend = NetworkService.backend()
+        network, age = _scan_cache.lookup(saved.ssid)
+        bssid = network.bssid if network is not None and age <= NetworkService.DETAILS_MAX_AGE else None
+        if bssid:
+            try:
+                backend.activate_connection(saved.uuid, bssid, on_progress, deadline - time.monotonic())
+                return
+            except ConnectionNotFoundError:
+                # The access point went away since the scan; the profile may still be fine
+                print(f"Access point {bssid} not found, activating {saved.name} on any")
+        NetworkService._check_attempt(deadline)
+        backend.activate_connection(saved.uuid, None, on_progress, deadline - time.monotonic())
+
+    @staticmethod
+    def _check_attempt(deadline: float) -> None:
+        """Stop before retrying a connection attempt that was cancelled or ran out of time"""
+        if _connect_cancelled.is_set():
+            raise ActivationFailedError("cancelled")
+        if time.monotonic() >= deadline:
+            raise ActivationFailedError("timed out")
+
+    @staticmethod
+    def is_connecting() -> bool:
+        """Whether a connection attempt is in progress"""
+        return _connecting > 0
+
+    @staticmethod
+    def cancel_connect() -> None:
+        """Abandon the connection attempt in progress, deactivating the pending connection"""
+        with _connecting_lock:
+            if _connecting == 0:
+                return
+            _connect_cancelled.set()
+        try:
+            NetworkService.backend().cancel_activation()
+        except Exception as e:
+            print(f"Error cancelling connection attempt: {e}")
+
+    @staticmethod
+    def _probe(ssid: str) -> None:
+        """Let NetworkManager see an SSID before connecting, with a directed scan unless it was seen just now.
+
+        The outcome is only advisory: hidden and just-in-range networks often
+        miss the scan, so the connection attempt itself decides.
+        """
+        network, age = _scan_cache.lookup(ssid)
+        if network is not None and age <= NetworkService.DETAILS_MAX_AGE:
+            return
+        try:
+            if NetworkService.rescan_network(ssid) is None:
+                print(f"Directed scan did not find {ssid}, connecting anyway")
+        except Exception as e:
+            print(f"Directed scan for {ssid} failed: {e}")
 
     @staticmethod
     def disconnect_network(ssid:str) -> Tuple[bool, str]: 
         """Disconnect to a network using improved disconnection method"""
         try:
-            nmcli.connection.down(ssid)
+            NetworkService.backend().disconnect(ssid)
             return True, "Disconnected Successfully"
         except Exception as e:
             return False, f"Connection error: {str(e)}"
+        finally:
+            _queries.invalidate(ACCESS_POINTS)
+            _scan_cache.expire()
 
 
     @staticmethod
-    def get_wifi_details(ssid: str):
-        """Get detailed information about a specific wifi network"""
+    def get_wifi_details(ssid: str, max_age: Optional[float] = None,
+                         rescan: bool = False) -> Optional[NetworkInfo]:
+        """
+        Get detailed information about a specific wifi network.
+        
+        Served from the scan index when the entry is younger than max_age
+        (defaults to DETAILS_MAX_AGE); otherwise only this network is looked
+        up again, with a directed scan for it when rescan is set, and its
+        index entry refreshed; only a finished scan resets the entry's age.
+        """
+        if max_age is None:
+            max_age = NetworkService.DETAILS_MAX_AGE
+        
+        network, age = _scan_cache.lookup(ssid)
+        if network is not None and age <= max_age:
+            return network
+        
+        if rescan:
+            try:
+                return NetworkService.rescan_network(ssid)
+            except Exception as e:
+                print(f"Directed scan for {ssid} failed: {e}")
+        
         try:
-            for wifi in nmcli.device.wifi():
-                if wifi.ssid == ssid:
-                    return NetworkInfo.from_wifi_device(wifi)
-            return None
+            access_points = [
+                network for network in _queries.get(ACCESS_POINTS, NetworkService.backend().get_access_points)
+                if network.ssid == ssid
+            ]
+            if not access_points:
+                return None
+            network = NetworkService._join_saved(NetworkInfo.group_by_ssid(access_points))[0]
+            # No scan ran, so the entry is no fresher than before
+            _scan_cache.update(network, keep_age=True)
+            return network
         except Exception as e:
             print(f"Error getting wifi details: {e}")
             return None
     
     @staticmethod
-    def check_networkmanager():
-        """Check if NetworkManager is available on the system"""
-        # Check if nmcli command is available
-        if not shutil.which("nmcli"):
-            print("Error: NetworkManager is not installed or not available in PATH.")
-            print("Please install NetworkManager to use this application.")
-            return False
+    def rescan_network(ssid: str) -> Optional[NetworkInfo]:
+        """
+        Scan for a single SSID and return it with fresh signal data.
+        
+        Directed scans only probe for this network, so they finish much
+        sooner than a full rescan and also find hidden networks. Returns
+        None if the network is not in range.
+        
+        Raises:
+            Backend errors, so callers can tell "not found" from "could not scan"
+        """
+        # Concurrent scans for the same network share one probe
+        access_points, finished = _queries.get(
+            f"rescan:{ssid}",
+            lambda: NetworkService.backend().rescan_ssids([ssid], NetworkService.TARGETED_SCAN_TIMEOUT),
+            memoize=False
+        )
+        # The full access point list just changed underneath any memoized copy
+        _queries.invalidate(ACCESS_POINTS)
+        if not access_points:
+            return None
+        network = NetworkService._join_saved(NetworkInfo.group_by_ssid(access_points))[0]
+        # If the scan wasn't seen to finish these may be older results; don't pass them off as fresh
+        _scan_cache.update(network, keep_age=not finished)
+        return network
+    
+    @staticmethod
+    def _join_saved(networks: List[NetworkInfo]) -> List[NetworkInfo]:
+        """
+        Attach to each network the saved profile NetworkManager would pick for it.
         
-        # Check if NetworkManager service is running
+        Uses the saved-connection index (one bulk query), so the UI knows
+        whether a network is saved without asking again. If the index can't
+        be loaded the networks are returned as they are, with is_saved None.
+        """
         try:
-            result = subprocess.run(
-                ["nmcli", "general", "status"],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            if result.returncode != 0:
-                print("Error: NetworkManager is not running.")
-                print("Please start the NetworkManager service.")
-                return False
-        except subprocess.TimeoutExpired:
-            print("Error: NetworkManager is not responding.")
-            return False
+            profiles = {network.ssid: _saved_connections.get(network.ssid) for network in networks}
         except Exception as e:
-            print(f"Error: Could not check NetworkManager status: {e}")
-            return False
+            print(f"Error loading saved connections: {e}")
+            return networks
         
-        return True
+        joined = []
+        for network in networks:
+            if not profiles[network.ssid]:
+                joined.append(replace(network, is_saved=False, profile_uuid=None,
+                                      autoconnect_priority=None, last_connected=None))
+                continue
+            saved = max(profiles[network.ssid], key=lambda saved: saved.preference())
+            joined.append(replace(network, is_saved=True, profile_uuid=saved.uuid,
+                                  autoconnect_priority=saved.autoconnect_priority,
+                                  last_connected=saved.timestamp or None))
+        return joined
+    
+    @staticmethod
+    def networkmanager_status() -> Tuple[bool, str]:
+        """Return whether NetworkManager is available, with a message explaining why not"""
+        try:
+            return NetworkService.backend().check_available()
+        except Exception as e:
+            return False, f"Error: Could not check NetworkManager status: {e}"
 
+    # Asynchronous API: each call runs on the shared workers and returns a Task.
+    # Callbacks run on the GLib main loop with the same value the blocking method
+    # returns; the Task can also be awaited. Passing an owner widget drops the
+    # result once that widget has been unrealized.
+
+    @staticmethod
+    def check_async(callback: Optional[Callable[[Tuple[bool, str]], None]] = None,
+                    on_error: Optional[Callable[[Exception], None]] = None,
+                    timeout: Optional[float] = QUERY_TIMEOUT, owner=None) -> Task:
+        """Check that NetworkManager is available without blocking"""
+        return run_in_background(NetworkService.networkmanager_status, on_done=callback,
+                                 on_error=on_error, owner=owner, timeout=timeout)
+
+    @staticmethod
+    def status_async(callback: Optional[Callable[[bool], None]] = None,
+                     on_error: Optional[Callable[[Exception], None]] = None,
+                     timeout: Optional[float] = QUERY_TIMEOUT, owner=None) -> Task:
+        """Get Wi-Fi radio status without blocking"""
+        return run_in_background(NetworkService.get_wifi_status, on_done=callback,
+                                 on_error=on_error, owner=owner, timeout=timeout)
+
+    @staticmethod
+    def is_known_async(ssid: str, callback: Optional[Callable[[bool], None]] = None,
+                       on_error: Optional[Callable[[Exception], None]] = None,
+                       timeout: Optional[float] = QUERY_TIMEOUT, owner=None) -> Task:
+        """Check whether a network has a saved profile without blocking"""
+        return run_in_background(NetworkService.is_wifi_known, ssid, on_done=callback,
+                                 on_error=on_error, owner=owner, timeout=timeout)
+
+    @staticmethod
+    def toggle_wifi_async(state: bool, callback: Optional[Callable[[bool], None]] = None,
+                          on_error: Optional[Callable[[Exception], None]] = None,
+                          timeout: Optional[float] = QUERY_TIMEOUT, owner=None) -> Task:
+        """Enable or disable Wi-Fi without blocking"""
+        return run_in_background(NetworkService.toggle_wifi, state, on_done=callback,
+                                 on_error=on_error, owner=owner, mutating=True, timeout=timeout)
+
+    @staticmethod
+    def scan_async(force_rescan: bool = True,
+                   callback: Optional[Callable[[List[NetworkInfo]], None]] = None,
+                   on_error: Optional[Callable[[Exception], None]] = None,
+                   timeout: Optional[float] = SCAN_TIMEOUT + QUERY_TIMEOUT, owner=None) -> Task:
+        """Scan for networks without blocking"""
+        return run_in_background(NetworkService.scan_networks, force_rescan, on_done=callback,
+                                 on_error=on_error, owner=owner, timeout=timeout)
+
+    @staticmethod
+    def details_async(ssid: str, callback: Optional[Callable[[Optional[NetworkInfo]], None]] = None,
+                      on_error: Optional[Callable[[Exception], None]] = None,
+                      timeout: Optional[float] = QUERY_TIMEOUT, owner=None, rescan: bool = False,
+                      max_age: Optional[float] = None) -> Task:
+        """Get detailed information about a network without blocking"""
+        return run_in_background(NetworkService.get_wifi_details, ssid, max_age, rescan, on_done=callback,
+                                 on_error=on_error, owner=owner, timeout=timeout)
+
+    @staticmethod
+    def connect_async(ssid: str, password: Optional[str] = None,
+                      callback: Optional[Callable[[ConnectResult], None]] = None,
+                      on_error: Optional[Callable[[Exception], None]] = None,
+                      timeout: Optional[float] = None, owner=None,
+                      on_progress: Optional[ProgressCallback] = None) -> Task:
+        """Connect to a network without blocking; activation stages go to on_progress on the main loop"""
+        progress = main_loop_callback(on_progress, owner=owner, repeating=True) if on_progress else None
+        
+        def connect_with_progress():
+            try:
+                return NetworkService.connect_to_network(ssid, password, progress)
+            finally:
+                if progress is not None:
+                    progress.release()
+        
+        return run_in_background(connect_with_progress, on_done=callback, on_error=on_error,
+                                 owner=owner, mutating=True, timeout=timeout)
+
+    @staticmethod
+    def cancel_connect_async(callback: Optional[Callable[[None], None]] = None,
+                             on_error: Optional[Callable[[Exception], None]] = None,
+                             timeout: Optional[float] = QUERY_TIMEOUT, owner=None) -> Task:
+        """Cancel the connection attempt in progress without blocking"""
+        # Not mutating: the write worker is busy with the attempt being cancelled
+        return run_in_background(NetworkService.cancel_connect, on_done=callback,
+                                 on_error=on_error, owner=owner, timeout=timeout)
+
+    @staticmethod
+    def disconnect_async(ssid: str, callback: Optional[Callable[[Tuple[bool, str]], None]] = None,
+                         on_error: Optional[Callable[[Exception], None]] = None,
+                         timeout: Optional[float] = None, owner=None) -> Task:
+        """Disconnect from a network without blocking"""
+        return run_in_background(NetworkService.disconnect_network, ssid, on_done=callback,
+                                 on_error=on_error, owner=owner, mutating=True, timeout=timeout)
+
+    @staticmethod
+    def forget_async(ssid: str, callback: Optional[Callable[[Tuple[bool, str]], None]] = None,
+                     on_error: Optional[Callable[[Exception], None]] = None,
+                     timeout: Optional[float] = None, owner=None) -> Task:
+        """Forget a saved network without blocking"""
+        return run_in_background(NetworkService.forget_wifi, ssid, on_done=callback,
+                                 on_error=on_error, owner=owner, mutating=True, timeout=timeout)
+
+    @staticmethod
+    def forget_networks_async(ssids: Iterable[str],
+                              callback: Optional[Callable[[Dict[str, Tuple[bool, str]]], None]] = None,
+                              on_error: Optional[Callable[[Exception], None]] = None,
+                              timeout: Optional[float] = None, owner=None) -> Task:
+        """Forget several saved networks without blocking"""
+        return run_in_background(NetworkService.forget_networks, list(ssids), on_done=callback,
+                                 on_error=on_error, owner=owner, mutating=True, timeout=timeout)
@@ -0,0 +1,67 @@
+"""Streams NetworkManager change notifications to the UI"""
+
+from typing import Callable, List, Optional, Set
+
+from gi.repository import GLib
+
+from models import NetworkEvent
+from network_service import NetworkService
+
+# Bursts of events (a scan touches every AP) are coalesced into one dispatch
+DEBOUNCE_MS = 300
+
+class NetworkWatcher:
+    """Collects backend change events and hands them to listeners in batches.
+
+    Everything here runs on the GLib main loop; listeners receive the set of
+    event kinds seen since the previous dispatch.
+    """
+
+    def __init__(self):
+        self._listeners: List[Callable[[Set[NetworkEvent]], None]] = []
+        self._pending: Set[NetworkEvent] = set()
+        self._dispatch_id: Optional[int] = None
+        self._stop_monitor: Optional[Callable[[], None]] = None
+
+    def add_listener(self, listener: Callable[[Set[NetworkEvent]], None]) -> None:
+        """Register a callback invoked with each batch of events"""
+        self._listeners.append(listener)
+
+    def start(self) -> bool:
+        """Start monitoring; returns False if the backend can't be watched"""
+        if self._stop_monitor is not None:
+            return True
+        try:
+            self._stop_monitor = NetworkService.backend().start_monitor(self._on_events)
+            return True
+        except Exception as e:
+            print(f"Error starting network monitor: {e}")
+            return False
+
+    def stop(self) -> None:
+        """Stop monitoring and drop any undelivered events"""
+        if self._stop_monitor is not None:
+            self._stop_monitor()
+            self._stop_monitor = None
+        if self._dispatch_id is not None:
+            GLib.source_remove(self._dispatch_id)
+            self._dispatch_id = None
+        self._pending.clear()
+
+    def _on_events(self, events: Set[NetworkEvent]) -> None:
+        # Invalidate right away so lookups made before dispatch see fresh data
+        NetworkService.invalidate_for_events(events)
+
+        self._pending |= events
+        if self._dispatch_id is None:
+            self._dispatch_id = GLib.timeout_add(DEBOUNCE_MS, self._dispatch)
+
+    def _dispatch(self) -> bool:
+        self._dispatch_id = None
+        events, self._pending = self._pending, set()
+        for listener in self._listeners:
+            try:
+                listener(events)
+            except Exception as e:
+                print(f"Error handling network events: {e}")
+        return False
@@ -0,0 +1,184 @@
+"""Timing spans for backend calls and main-loop work, exported as a Chrome trace"""
+
+import collections
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+
+# Span categories
+BACKEND = "backend"
+SUBPROCESS = "subprocess"
+DBUS = "dbus"
+WORKER = "worker"
+MAIN_LOOP = "main-loop"
+
+# Main-loop work longer than one 60 Hz frame is marked as a stall
+FRAME_BUDGET_MS = 16
+# Spans kept for the debug overlay
+RECENT_SPANS = 50
+# Upper bound on stored trace events, so a long session can't exhaust memory
+MAX_EVENTS = 500_000
+
+_lock = threading.Lock()
+_enabled = False
+_origin = time.perf_counter()
+_events: List[Dict[str, Any]] = []
+_recent: Deque[Dict[str, Any]] = collections.deque(maxlen=RECENT_SPANS)
+_thread_names: Dict[int, str] = {}
+_local = threading.local()
+
+class Profiler:
+    """Collects timing spans while --profile is on.
+
+    Every call is a cheap no-op until enable() is called, so instrumentation
+    stays in place permanently. Spans nest per thread: a span counts the
+    child spans of each category opened inside it (e.g. how many nmcli
+    processes one backend call spawned).
+    """
+
+    @staticmethod
+    def enable() -> None:
+        """Start recording"""
+        global _enabled
+        _enabled = True
+
+    @staticmethod
+    def is_enabled() -> bool:
+        return _enabled
+
+    @staticmethod
+    @contextmanager
+    def span(name: str, category: str, **args) -> Iterator[Dict[str, Any]]:
+        """Time the enclosed block; args end up in the trace (add to the yielded dict to extend them)"""
+        if not _enabled:
+            yield args
+            return
+
+        stack = getattr(_local, "stack", None)
+        if stack is None:
+            stack = _local.stack = []
+        if stack:
+            parent = stack[-1]
+            parent[f"{category}_calls"] = parent.get(f"{category}_calls", 0) + 1
+
+        stack.append(args)
+        outcome = "ok"
+        start = time.perf_counter()
+        try:
+            yield args
+        except BaseException as e:
+            outcome = type(e).__name__
+            raise
+        finally:
+            duration = time.perf_counter() - start
+            stack.pop()
+            args["outcome"] = outcome
+            if category == MAIN_LOOP and duration * 1000 > FRAME_BUDGET_MS:
+                args["stall"] = True
+            Profiler._record({
+                "name": name, "cat": category, "ph": "X",
+                "ts": (start - _origin) * 1e6, "dur": duration * 1e6, "args": args,
+            })
+
+    @staticmethod
+    def traced(name: Optional[str] = None, category: str = MAIN_LOOP) -> Callable:
+        """Decorator wrapping every call of a function in a span"""
+        def decorate(fn: Callable) -> Callable:
+            label = name or fn.__qualname__
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not _enabled:
+                    return fn(*args, **kwargs)
+                with Profiler.span(label, category):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    @staticmethod
+    def wrap(target: Any, category: str = BACKEND) -> Any:
+        """Return a proxy that times every public method call on target"""
+        return _TracedProxy(target, category)
+
+    @staticmethod
+    def instant(name: str, category: str, **args) -> None:
+        """Record a point-in-time event"""
+        if _enabled:
+            Profiler._record({
+                "name": name, "cat": category, "ph": "i", "s": "t",
+                "ts": (time.perf_counter() - _origin) * 1e6, "args": args,
+            })
+
+    @staticmethod
+    def counter(name: str, value: float) -> None:
+        """Record a sample of a value plotted over time"""
+        if _enabled:
+            Profiler._record({
+                "name": name, "ph": "C",
+                "ts": (time.perf_counter() - _origin) * 1e6, "args": {"value": value},
+            })
+
+    @staticmethod
+    def recent() -> List[Dict[str, Any]]:
+        """Most recent spans, newest first"""
+        with _lock:
+            return list(reversed(_recent))
+
+    @staticmethod
+    def dump(path: str) -> None:
+        """Write everything recorded so far as Chrome trace JSON (chrome://tracing, Perfetto)"""
+        pid = os.getpid()
+        with _lock:
+            events = list(_events)
+            thread_names = dict(_thread_names)
+
+        metadata = [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": thread_name}}
+            for tid, thread_name in thread_names.items()
+        ]
+        try:
+            with open(path, "w") as f:
+                json.dump({"traceEvents": metadata + events, "displayTimeUnit": "ms"}, f)
+            print(f"Wrote profile trace with {len(events)} events to {path}")
+        except OSError as e:
+            print(f"Error writing profile trace: {e}")
+
+    @staticmethod
+    def _record(event: Dict[str, Any]) -> None:
+        thread = threading.current_thread()
+        event["pid"] = os.getpid()
+        event["tid"] = thread.ident
+        with _lock:
+            _thread_names.setdefault(thread.ident, thread.name)
+            if len(_events) < MAX_EVENTS:
+                _events.append(event)
+            if event["ph"] == "X":
+                _recent.append(event)
+
+class _TracedProxy:
+    """Times public method calls on the wrapped object; everything else passes through"""
+
+    def __init__(self, target: Any, category: str):
+        self._target = target
+        self._category = category
+
+    def __getattr__(self, attr: str) -> Any:
+        value = getattr(self._target, attr)
+        if attr.startswith("_") or not callable(value):
+            return value
+
+        label = f"{type(self._target).__name__}.{attr}"
+
+        @functools.wraps(value)
+        def traced(*args, **kwargs):
+            if not _enabled:
+                return value(*args, **kwargs)
+            # Only the first argument (an SSID or profile name) is recorded; never passwords
+            span_args = {"target": args[0]} if args and isinstance(args[0], str) else {}
+            with Profiler.span(label, self._category, **span_args):
+                return value(*args, **kwargs)
+        return traced
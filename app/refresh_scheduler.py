@@ -0,0 +1,89 @@
+"""Periodic reloading of NetworkManager's cached scan results"""
+
+from typing import Callable, Optional
+
+from gi.repository import GLib
+
+# Seconds between refreshes while a connection is being activated,
+# while the window has focus, and while it is open in the background
+BUSY_INTERVAL = 2
+FOCUSED_INTERVAL = 5
+BACKGROUND_INTERVAL = 30
+
+class RefreshScheduler:
+    """Calls refresh on an interval that follows what the user is doing.
+
+    The refresh is meant to read results NetworkManager already has, so it
+    never wakes the radio. Ticks come faster while a connection is in
+    progress and the window is focused, slower when the window sits in the
+    background, and stop entirely while it is hidden or the radio is off.
+    Timers use whole seconds so GLib can batch them with other wakeups.
+    """
+
+    def __init__(self, refresh: Callable[[], None], is_busy: Callable[[], bool] = lambda: False):
+        self._refresh = refresh
+        self._is_busy = is_busy
+        self._focused = False
+        self._visible = False
+        self._radio_enabled = False
+        self._timer_id: Optional[int] = None
+        self._interval: Optional[int] = None
+
+    def set_focused(self, focused: bool) -> None:
+        self._focused = focused
+        self.reschedule()
+
+    def set_visible(self, visible: bool) -> None:
+        self._visible = visible
+        self.reschedule()
+
+    def set_radio_enabled(self, enabled: bool) -> None:
+        self._radio_enabled = enabled
+        self.reschedule()
+
+    def postpone(self) -> None:
+        """Restart the countdown, e.g. after the data was refreshed for another reason"""
+        self._stop()
+        self.reschedule()
+
+    def stop(self) -> None:
+        """Stop refreshing for good"""
+        self._radio_enabled = False
+        self._stop()
+
+    def reschedule(self) -> None:
+        """Start, stop or retime the timer for the current state"""
+        interval = self._current_interval()
+        if interval == self._interval:
+            return
+        self._stop()
+        if interval is not None:
+            self._interval = interval
+            self._timer_id = GLib.timeout_add_seconds(interval, self._tick)
+
+    def _current_interval(self) -> Optional[int]:
+        if not self._visible or not self._radio_enabled:
+            return None
+        if not self._focused:
+            return BACKGROUND_INTERVAL
+        return BUSY_INTERVAL if self._is_busy() else FOCUSED_INTERVAL
+
+    def _stop(self) -> None:
+        if self._timer_id is not None:
+            GLib.source_remove(self._timer_id)
+            self._timer_id = None
+        self._interval = None
+
+    def _tick(self) -> bool:
+        try:
+            self._refresh()
+        except Exception as e:
+            print(f"Error during scheduled refresh: {e}")
+
+        # A connection may have started or finished since the timer was set
+        if self._current_interval() == self._interval:
+            return True
+        self._timer_id = None
+        self._interval = None
+        self.reschedule()
+        return False
@@ -0,0 +1,83 @@
+"""On-disk copy of the last scan, used to draw the network list at startup"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import List, Optional
+
+from models import NetworkInfo, SavedConnection
+
+# Bump when the file layout changes; older files are ignored
+SNAPSHOT_VERSION = 1
+
+_write_lock = threading.Lock()
+_last_written: Optional[bytes] = None
+
+@dataclass
+class ScanSnapshot:
+    """Networks and saved profiles as they were when the app last scanned"""
+    networks: List[NetworkInfo]
+    saved_connections: List[SavedConnection] = field(default_factory=list)
+    saved_at: float = 0.0
+
+    @staticmethod
+    def path() -> str:
+        """Location of the snapshot file under $XDG_CACHE_HOME"""
+        cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+        return os.path.join(cache_home, "nmgui", "last-scan.json")
+
+    @classmethod
+    def load(cls) -> Optional["ScanSnapshot"]:
+        """Read the snapshot, or None if there is none or it can't be used"""
+        try:
+            with open(cls.path(), "rb") as f:
+                data = json.loads(f.read())
+            if data.get("version") != SNAPSHOT_VERSION:
+                return None
+            return cls(
+                networks=[cls._network_from_dict(network) for network in data["networks"]],
+                saved_connections=[SavedConnection(**saved) for saved in data["saved_connections"]],
+                saved_at=data["saved_at"]
+            )
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Ignoring unreadable scan snapshot: {e}")
+            return None
+
+    def save(self) -> None:
+        """Write the snapshot atomically; unchanged contents aren't rewritten"""
+        global _last_written
+        payload = json.dumps({
+            "version": SNAPSHOT_VERSION,
+            "networks": [asdict(network) for network in self.networks],
+            "saved_connections": [asdict(saved) for saved in self.saved_connections],
+        }, separators=(",", ":"))
+
+        with _write_lock:
+            if payload.encode() == _last_written:
+                return
+            # saved_at is left out of the comparison so identical scans don't touch the disk
+            data = payload[:-1] + f',"saved_at":{self.saved_at or time.time()}}}'
+            path = self.path()
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(prefix=".last-scan-", dir=os.path.dirname(path))
+                try:
+                    with os.fdopen(fd, "w") as f:
+                        f.write(data)
+                    os.replace(tmp_path, path)
+                except BaseException:
+                    os.unlink(tmp_path)
+                    raise
+                _last_written = payload.encode()
+            except OSError as e:
+                print(f"Error saving scan snapshot: {e}")
+
+    @staticmethod
+    def _network_from_dict(data: dict) -> NetworkInfo:
+        access_points = [NetworkInfo(**ap) for ap in data.pop("access_points", [])]
+        return NetworkInfo(**data, access_points=access_points)
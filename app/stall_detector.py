@@ -0,0 +1,84 @@
+"""Reports main-loop handlers that block long enough to drop frames"""
+
+import sys
+import threading
+import time
+import traceback
+from typing import List, Optional
+
+from gi.repository import GLib
+
+from profiler import Profiler, MAIN_LOOP
+
+# One frame at 60 Hz
+STALL_THRESHOLD_MS = 16
+# How often the main loop checks in while the detector runs
+HEARTBEAT_MS = 4
+
+class StallDetector:
+    """Watchdog for the GLib main loop.
+
+    A high-priority timer on the main loop records a heartbeat. A watcher
+    thread samples the main thread's Python stack whenever the heartbeat is
+    late, so the handler that was blocking can be named once the loop gets
+    going again.
+    """
+
+    def __init__(self, threshold_ms: float = STALL_THRESHOLD_MS):
+        self._threshold = threshold_ms / 1000
+        self._interval = HEARTBEAT_MS / 1000
+        self._main_thread = threading.get_ident()
+        self._lock = threading.Lock()
+        self._last_beat = time.monotonic()
+        self._stack: Optional[List[traceback.FrameSummary]] = None
+        self._running = False
+        self._timer_id: Optional[int] = None
+
+    def start(self) -> None:
+        """Start watching; must be called from the main thread"""
+        if self._running:
+            return
+        self._running = True
+        self._main_thread = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._timer_id = GLib.timeout_add(HEARTBEAT_MS, self._beat, priority=GLib.PRIORITY_HIGH)
+        threading.Thread(target=self._watch, name="nmgui-stall-detector", daemon=True).start()
+
+    def stop(self) -> None:
+        """Stop watching"""
+        self._running = False
+        if self._timer_id is not None:
+            GLib.source_remove(self._timer_id)
+            self._timer_id = None
+
+    def _beat(self) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            blocked = now - self._last_beat - self._interval
+            stack, self._stack = self._stack, None
+            self._last_beat = now
+
+        if blocked > self._threshold:
+            where = self._describe(stack)
+            print(f"Main loop stalled for {blocked * 1000:.0f} ms{where}")
+            Profiler.instant("main loop stall", MAIN_LOOP, blocked_ms=round(blocked * 1000, 1), where=where)
+        return self._running
+
+    def _watch(self) -> None:
+        while self._running:
+            time.sleep(self._threshold / 2)
+            with self._lock:
+                late = time.monotonic() - self._last_beat - self._interval > self._threshold
+                if not late or self._stack is not None:
+                    continue
+                frame = sys._current_frames().get(self._main_thread)
+                # Keep the first sample: it shows where the blocking call was made
+                self._stack = traceback.extract_stack(frame) if frame is not None else []
+
+    @staticmethod
+    def _describe(stack: Optional[List[traceback.FrameSummary]]) -> str:
+        """Format the innermost frames of a sampled stack"""
+        if not stack:
+            return " (outside Python code)"
+        frames = [f"{frame.name} ({frame.filename}:{frame.lineno})" for frame in reversed(stack[-4:])]
+        return " in " + " <- ".join(frames)
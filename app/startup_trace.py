@@ -0,0 +1,39 @@
+"""Per-phase startup timings printed with --startup-trace"""
+
+import threading
+import time
+from typing import Optional, Set
+
+_lock = threading.Lock()
+_start: Optional[float] = None
+_last = 0.0
+_seen: Set[str] = set()
+
+class StartupTrace:
+    """Records when each startup phase is first reached.
+
+    Marks are no-ops until enable() is called, so call sites can stay in
+    place without cost. Safe to call from worker threads.
+    """
+
+    @staticmethod
+    def enable(start: float) -> None:
+        """Start printing marks, measured from start (a time.perf_counter() value)"""
+        global _start, _last
+        with _lock:
+            _start = _last = start
+
+    @staticmethod
+    def mark(phase: str) -> None:
+        """Print the time since startup and since the previous mark, once per phase"""
+        global _last
+        if _start is None:
+            return
+        now = time.perf_counter()
+        with _lock:
+            if phase in _seen:
+                return
+            _seen.add(phase)
+            since_start, since_last = now - _start, now - _last
+            _last = now
+        print(f"[startup] {since_start * 1000:8.1f} ms  (+{since_last * 1000:6.1f} ms)  {phase}")
@@ -0,0 +1,50 @@
+"""Debug overlay listing recent timing spans while profiling"""
+
+import gi
+gi.require_version("Gtk", "4.0")
+from gi.repository import Gtk, GLib
+
+from profiler import Profiler
+
+# How often the overlay redraws, and how many spans it lists
+REFRESH_MS = 500
+SHOWN_SPANS = 12
+
+class DebugOverlay(Gtk.Label):
+    """Live list of the slowest recent operations, drawn over the window"""
+
+    def __init__(self):
+        super().__init__(xalign=0, yalign=0, visible=False)
+        self.set_name("debug-overlay")
+        self.set_halign(Gtk.Align.END)
+        self.set_valign(Gtk.Align.END)
+        self.set_can_target(False)  # clicks go to the window underneath
+        self.refresh_id = None
+
+    def toggle(self):
+        """Show or hide the overlay"""
+        if self.get_visible():
+            self.set_visible(False)
+            GLib.source_remove(self.refresh_id)
+            self.refresh_id = None
+        else:
+            self._refresh()
+            self.set_visible(True)
+            self.refresh_id = GLib.timeout_add(REFRESH_MS, self._refresh)
+
+    def _refresh(self):
+        """Redraw from the most recent spans, slowest first"""
+        spans = sorted(Profiler.recent(), key=lambda span: span["dur"], reverse=True)[:SHOWN_SPANS]
+        lines = []
+        for span in spans:
+            args = span["args"]
+            calls = sum(value for key, value in args.items() if key.endswith("_calls"))
+            flags = "".join([
+                f" [{calls} calls]" if calls else "",
+                " STALL" if args.get("stall") else "",
+                f" {args['outcome']}" if args.get("outcome", "ok") != "ok" else "",
+            ])
+            lines.append(f"{span['dur'] / 1000:8.1f} ms  {span['cat']:<10} {span['name']}{flags}")
+
+        self.set_label("\n".join(lines) or "No spans recorded yet")
+        return True
@@ -1,15 +1,19 @@
 import gi
 
-from models import NetworkInfo, WiFiState
+from models import NetworkEvent, NetworkInfo, WiFiState
 from ui.network_list import NetworkListWidget
 gi.require_version("Gtk", "4.0")
-from gi.repository import Gtk, Gdk, GLib
+from gi.repository import Gtk, Gdk
 from typing import Optional
 
 from network_service import NetworkService 
-from ui.network_details import NetworkDetailsWidget
 from ui.wifi_off import WiFiOffWidget
 from ui.dialogs import PasswordDialog
+from ui.utils import UIUtils
+from network_watcher import NetworkWatcher
+from refresh_scheduler import RefreshScheduler
+from startup_trace import StartupTrace
+from profiler import Profiler, FRAME_BUDGET_MS, MAIN_LOOP
 
 class NetworkManagerWindow(Gtk.ApplicationWindow):
     """Main application window"""
@@ -21,14 +25,70 @@ class NetworkManagerWindow(Gtk.ApplicationWindow):
         
         self.current_state = WiFiState.OFF
         self.current_view = "list"  # "list" or "details"
+        self.wifi_pending = False
         self._setup_ui()
+        self.connect("map", lambda _: StartupTrace.mark("window mapped"))
+        
+        # Show the list right away: the previous run's networks if they were saved,
+        # otherwise the scanning message. The NetworkManager check, the radio status
+        # and the first scan all run in parallel while the window is on screen.
+        if NetworkService.restore_snapshot():
+            self.network_list.load_cached()
+            self._show_network_list()
+        else:
+            self._show_network_list(scan_immediately=True)
         self._update_wifi_state(initial_load=True)
+        NetworkService.check_async(callback=self._on_networkmanager_checked, owner=self)
+
+        # React to changes made outside the app (other applets, nmcli, roaming)
+        self.watcher = NetworkWatcher()
+        self.watcher.add_listener(self._on_network_events)
+        self.connect("close-request", lambda _: self.watcher.stop())
+        
+        # Keep signal strengths current from NetworkManager's cached results
+        self.refresh_scheduler = RefreshScheduler(
+            self._on_refresh_tick,
+            is_busy=lambda: self.current_state == WiFiState.CONNECTING or NetworkService.is_connecting()
+        )
+        self.connect("notify::is-active", lambda *_: self.refresh_scheduler.set_focused(self.is_active()))
+        self.connect("map", lambda _: self._update_refresh_visibility())
+        self.connect("unmap", lambda _: self._update_refresh_visibility())
+        self.connect("realize", self._on_realized)
+        self.connect("close-request", lambda _: self.refresh_scheduler.stop())
 
         # keypress logic for handling ESC
         key_controller = Gtk.EventControllerKey.new()
         key_controller.connect("key-pressed", self._on_esc_pressed)
         self.add_controller(key_controller)
     
+    @Profiler.traced()
+    def _on_networkmanager_checked(self, result):
+        """Start watching NetworkManager, or give up if it isn't available"""
+        available, message = result
+        StartupTrace.mark("NetworkManager checked")
+        if available:
+            self.watcher.start()
+        else:
+            self.get_application().fail(message)
+    
+    def _on_realized(self, window):
+        """Follow minimizing, which leaves the window mapped"""
+        self.get_surface().connect("notify::state", lambda *_: self._update_refresh_visibility())
+    
+    def _update_refresh_visibility(self):
+        """Pause periodic refreshes while nobody can see the window"""
+        surface = self.get_surface()
+        minimized = (surface is not None and isinstance(surface, Gdk.Toplevel)
+                     and bool(surface.get_state() & Gdk.ToplevelState.MINIMIZED))
+        self.refresh_scheduler.set_visible(self.get_mapped() and not minimized)
+    
+    @Profiler.traced()
+    def _on_refresh_tick(self):
+        """Periodic refresh: reload the list, and the details page if it is showing"""
+        self.network_list.refresh()
+        if self.current_view == "details":
+            self.network_details.refresh()
+    
     def _setup_ui(self):
         """Setup the main UI"""
         main_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=10)
@@ -40,10 +100,44 @@ class NetworkManagerWindow(Gtk.ApplicationWindow):
         main_box.append(self._create_wifi_toggle())
         main_box.append(Gtk.Separator(orientation=Gtk.Orientation.HORIZONTAL))
         
-        self.content_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, vexpand=True)
-        main_box.append(self.content_box)
+        # Pages are built once and kept alive, so switching between them is instant
+        # and the list keeps its rows and scroll position
+        self.stack = Gtk.Stack(vexpand=True)
+        self.network_list = NetworkListWidget(self._on_network_selected, self._on_network_details,
+                                              self._on_cancel_connect)
+        self.stack.add_named(self.network_list, "list")
+        self.stack.add_named(WiFiOffWidget(), "wifi-off")
+        self.network_details = None  # created the first time a network's details are shown
+        main_box.append(self.stack)
         
-        self.set_child(main_box)
+        self.debug_overlay = None
+        if Profiler.is_enabled():
+            self._setup_profiling(main_box)
+        else:
+            self.set_child(main_box)
+    
+    def _setup_profiling(self, main_box: Gtk.Box):
+        """Record frame times and add the debug overlay (toggled with F12)"""
+        from ui.debug_overlay import DebugOverlay
+        
+        self.debug_overlay = DebugOverlay()
+        overlay = Gtk.Overlay(child=main_box)
+        overlay.add_overlay(self.debug_overlay)
+        self.set_child(overlay)
+        
+        self.last_frame_time = None
+        self.add_tick_callback(self._on_frame_tick)
+    
+    def _on_frame_tick(self, widget, frame_clock):
+        """Record the interval between frames; long ones mean dropped frames"""
+        frame_time = frame_clock.get_frame_time()
+        if self.last_frame_time is not None:
+            interval_ms = (frame_time - self.last_frame_time) / 1000
+            Profiler.counter("frame interval (ms)", interval_ms)
+            if interval_ms > 2 * FRAME_BUDGET_MS:
+                Profiler.instant("dropped frames", MAIN_LOOP, interval_ms=round(interval_ms, 1))
+        self.last_frame_time = frame_time
+        return True
     
     def _create_wifi_toggle(self) -> Gtk.Box:
         """Create the WiFi toggle section"""
@@ -52,79 +146,132 @@ class NetworkManagerWindow(Gtk.ApplicationWindow):
         
         wifi_label = Gtk.Label(label="Wi-Fi", xalign=0, name="wifi-label")
         
+        # Shown while the radio state is being read or changed
+        self.wifi_spinner = Gtk.Spinner(valign=Gtk.Align.CENTER, visible=False)
+        
         toggle_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
         toggle_box.append(wifi_label)
         toggle_box.append(Gtk.Box(hexpand=True))  # Spacer
+        toggle_box.append(self.wifi_spinner)
         toggle_box.append(self.wifi_switch)
         
         return toggle_box
     
+    def _set_wifi_pending(self, pending: bool):
+        """Lock the switch and show the spinner while a radio request is running"""
+        self.wifi_pending = pending
+        self.wifi_switch.set_sensitive(not pending)
+        self.wifi_spinner.set_visible(pending)
+        self.wifi_spinner.set_spinning(pending)
+    
+    @Profiler.traced()
     def _on_wifi_toggled(self, switch, state):
         """Handle WiFi toggle"""
-        current_state = NetworkService.get_wifi_status()
-        
-        if current_state == state:
-            return
+        if self.wifi_pending or state == (self.current_state != WiFiState.OFF):
+            return False
         
-        if NetworkService.toggle_wifi(state):
-            self._update_wifi_state(scan_immediately=state)
-        else:
-            switch.set_active(current_state)
+        self._set_wifi_pending(True)
+        NetworkService.toggle_wifi_async(
+            state,
+            callback=lambda success: self._wifi_toggle_complete(state, success),
+            on_error=lambda error: self._wifi_toggle_complete(state, False),
+            owner=self
+        )
+        # The switch settles once NetworkManager reports the new state
+        return True
+    
+    def _wifi_toggle_complete(self, state: bool, success: bool):
+        """Handle the end of a radio toggle"""
+        if not success:
+            print(f"Failed to turn Wi-Fi {'on' if state else 'off'}")
+        self._update_wifi_state(scan_immediately=success and state)
     
     def _update_wifi_state(self, scan_immediately=False, initial_load=False):
         """Update the UI based on WiFi state"""
-        wifi_status = NetworkService.get_wifi_status()
+        def on_error(error):
+            print(f"Error getting Wi-Fi status: {error}")
+            self._apply_wifi_state(False)
+        
+        def on_status(wifi_status):
+            StartupTrace.mark("radio status")
+            # At startup the list is already on screen and being scanned
+            self._apply_wifi_state(wifi_status, scan_immediately, keep_list=initial_load)
+        
+        self._set_wifi_pending(True)
+        NetworkService.status_async(
+            callback=on_status,
+            on_error=on_error,
+            owner=self
+        )
+    
+    @Profiler.traced()
+    def _apply_wifi_state(self, wifi_status: bool, scan_immediately=False, keep_list=False):
+        """Show the list or the WiFi off page for the given radio state"""
+        self._set_wifi_pending(False)
+        # Update current_state first so the switch change below isn't taken for a user toggle
+        self.current_state = WiFiState.ON if wifi_status else WiFiState.OFF
         self.wifi_switch.set_active(wifi_status)
+        self.wifi_switch.set_state(wifi_status)
+        self.refresh_scheduler.set_radio_enabled(wifi_status)
         
         if wifi_status:
-            self.current_state = WiFiState.ON
-            if self.current_view == "list":
-                self._show_network_list(scan_immediately or initial_load)
+            if self.current_view == "list" and not keep_list:
+                self._show_network_list(scan_immediately)
         else:
-            self.current_state = WiFiState.OFF
             self.current_view = "list"
             self._show_wifi_off()
+            self.network_list.clear()
     
+    @Profiler.traced()
     def _show_network_list(self, scan_immediately=False):
-        """Show the network list widget"""
+        """Show the network list, which the watcher keeps current while it is hidden"""
         self.current_view = "list"
-        self._clear_content()
-        
-        self.network_list = NetworkListWidget(self._on_network_selected, self._on_network_details)
-        self.content_box.append(self.network_list)
+        self.stack.set_visible_child_name("list")
         
         if scan_immediately:
-            GLib.timeout_add(500, lambda: self.network_list.start_scan())
+            self.network_list.start_scan()
     
+    @Profiler.traced()
     def _show_network_details(self, network: NetworkInfo):
-        """Show the network details widget"""
-        self.current_view = "details"
-        self._clear_content()
+        """Show the details page, rebound to the given network"""
+        if self.network_details is None:
+            # Loaded on first use to keep it out of startup
+            from ui.network_details import NetworkDetailsWidget
+            
+            self.network_details = NetworkDetailsWidget(self._on_back_to_list)
+            self.stack.add_named(self.network_details, "details")
         
-        self.network_details = NetworkDetailsWidget(network, self._on_back_to_list)
-        self.content_box.append(self.network_details)
+        self.network_details.bind(network)
+        self.current_view = "details"
+        self.stack.set_visible_child_name("details")
     
     def _on_back_to_list(self):
         """Handle back button click from details view"""
-        self._show_network_list(scan_immediately=True)
+        self._show_network_list()
     
     def _show_wifi_off(self):
-        """Show the WiFi off widget"""
-        self._clear_content()
-        wifi_off_widget = WiFiOffWidget()
-        self.content_box.append(wifi_off_widget)
-    
-    def _clear_content(self):
-        """Clear the content area"""
-        child = self.content_box.get_first_child()
-        while child:
-            next_child = child.get_next_sibling()
-            self.content_box.remove(child)
-            child = next_child
+        """Show the WiFi off page"""
+        self.stack.set_visible_child_name("wifi-off")
     
+    @Profiler.traced()
     def _on_network_selected(self, network: NetworkInfo):
         """Handle network selection for connection"""
-        if NetworkService.is_wifi_known(network.ssid):
+        # Scan results normally say whether the network is saved; ask only if they couldn't
+        if network.is_saved is not None:
+            self._on_known_checked(network, network.is_saved)
+            return
+        
+        NetworkService.is_known_async(
+            network.ssid,
+            callback=lambda is_known: self._on_known_checked(network, is_known),
+            on_error=lambda error: self._on_known_checked(network, False),
+            owner=self
+        )
+    
+    @Profiler.traced()
+    def _on_known_checked(self, network: NetworkInfo, is_known: bool):
+        """Connect to a selected network, asking for a password if it needs one"""
+        if is_known:
             self._connect_to_network(network.ssid)
         elif network.requires_password:
             dialog = PasswordDialog(self, network.ssid, 
@@ -140,19 +287,37 @@ class NetworkManagerWindow(Gtk.ApplicationWindow):
     def _connect_to_network(self, ssid: str, password: Optional[str] = None):
         """Connect to a network"""
         self.current_state = WiFiState.CONNECTING
+        self.network_list.show_connect_progress(f"Connecting to {ssid}...")
         
-        def connect_thread():
-            success, message = NetworkService.connect_to_network(ssid, password)
-            GLib.idle_add(lambda: self._connection_complete(ssid, success, message))
-        
-        import threading
-        thread = threading.Thread(target=connect_thread)
-        thread.daemon = True
-        thread.start()
+        NetworkService.connect_async(
+            ssid, password,
+            callback=lambda result: self._connection_complete(ssid, *result),
+            on_error=lambda error: self._connection_complete(ssid, False, str(error)),
+            owner=self,
+            on_progress=self._on_connection_progress
+        )
+        # Follow the signal more closely while the connection comes up
+        self.refresh_scheduler.reschedule()
+    
+    def _on_connection_progress(self, state, reason):
+        """Show the current activation stage above the list"""
+        self.network_list.show_connect_progress(UIUtils.get_activation_label(state))
     
-    def _connection_complete(self, ssid: str, success: bool, message: str):
+    def _on_cancel_connect(self):
+        """Abandon the connection attempt in progress"""
+        self.network_list.show_connect_progress("Cancelling...")
+        NetworkService.cancel_connect_async(owner=self)
+    
+    @Profiler.traced()
+    def _connection_complete(self, ssid: str, success: bool, message: str, cancelled: bool = False):
         """Handle connection completion"""
         self.current_state = WiFiState.ON
+        self.refresh_scheduler.reschedule()
+        self.network_list.hide_connect_progress()
+        
+        if cancelled:
+            self.network_list.refresh()
+            return False
         
         dialog = Gtk.AlertDialog()
         if success:
@@ -165,19 +330,56 @@ class NetworkManagerWindow(Gtk.ApplicationWindow):
         dialog.set_modal(True)
         dialog.show(self)
         
-        if self.current_view == "list" and hasattr(self, 'network_list'):
-            self.network_list.start_scan()
+        self.network_list.refresh()
         
         return False
 
+    @Profiler.traced()
+    def _on_network_events(self, events):
+        """Apply changes reported by NetworkManager"""
+        if NetworkEvent.RADIO in events and not self.wifi_pending:
+            NetworkService.status_async(
+                callback=lambda wifi_on: self._on_radio_status(wifi_on, events), owner=self
+            )
+            return
+        
+        self._refresh_for_events(events)
+    
+    @Profiler.traced()
+    def _on_radio_status(self, wifi_on: bool, events):
+        """Follow radio changes made outside the app, then handle the other events"""
+        if wifi_on != (self.current_state != WiFiState.OFF):
+            self._apply_wifi_state(wifi_on, scan_immediately=wifi_on)
+            return
+        
+        self._refresh_for_events(events)
+    
+    def _refresh_for_events(self, events):
+        """Refresh the network list if the events affect it"""
+        if self.current_state == WiFiState.OFF:
+            return
+        
+        # The list stays current behind the details page, so going back needs no reload
+        list_events = {NetworkEvent.ACCESS_POINTS, NetworkEvent.SIGNAL, NetworkEvent.CONNECTION_STATE,
+                       NetworkEvent.SAVED_CONNECTIONS}
+        if events & list_events:
+            self.network_list.refresh()
+            # That was as good as a scheduled refresh
+            self.refresh_scheduler.postpone()
+
+    @Profiler.traced()
     def _on_esc_pressed(self, controller, keyval, keycode, state):
         """Back on details with ESC; quit from main list."""
         try:
+            if keyval == Gdk.KEY_F12 and self.debug_overlay is not None:
+                self.debug_overlay.toggle()
+                return True
+            
             if keyval == Gdk.KEY_Escape:
                 # If we're on a details page, go back to the list instead of quitting
                 if getattr(self, "current_view", "list") == "details":
-                    # (False means: don't force an immediate rescan; adjust if you prefer)
-                    self._show_network_list(True)
+                    # Results stay current through the watcher, so don't force a rescan
+                    self._show_network_list()
                     return True
 
                 # Otherwise we're on the main page; quit the app
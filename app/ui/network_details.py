@@ -1,30 +1,81 @@
 """Network details widget for displaying detailed network information"""
 
-import threading
+import time
 import gi
 gi.require_version("Gtk", "4.0")
-from gi.repository import Gtk, GLib
-import nmcli
+from gi.repository import Gtk
+from dataclasses import replace
+from typing import Optional
 
 from models import NetworkInfo
 from ui.utils import UIUtils
 from ui.dialogs import PasswordDialog
 from network_service import NetworkService
+from background import cancel_owned_tasks
 
 class NetworkDetailsWidget(Gtk.Box):
-    """Widget for displaying detailed network information"""
+    """Widget for displaying detailed network information.
     
-    def __init__(self, network: NetworkInfo, on_back_clicked):
+    The page is built once and rebound with bind() each time it is shown.
+    """
+    
+    def __init__(self, on_back_clicked):
         super().__init__(orientation=Gtk.Orientation.VERTICAL, spacing=0)
-        self.network = network
+        self.network: Optional[NetworkInfo] = None
         self.on_back_clicked = on_back_clicked
         self.advanced_rows: dict[str, Gtk.Widget] = {}
+        # What the access point list currently shows, so refreshes only rebuild it on changes
+        self.shown_access_points: Optional[tuple] = None
+        self.action_box: Optional[Gtk.Box] = None
+        self.join_button: Optional[Gtk.Button] = None
+        self.cancel_button: Optional[Gtk.Button] = None
+        self.disconnect_button: Optional[Gtk.Button] = None
+        self.forget_button: Optional[Gtk.Button] = None
+        self.known_check = None
+        # SSID of the connection attempt started here; it carries on across bind()
+        self.connecting_ssid: Optional[str] = None
         
         self._create_header()
         self._create_content()
-        self._create_action_buttons()
+    
+    def bind(self, network: NetworkInfo):
+        """Show another network, dropping anything still pending for the previous one.
+        
+        A connection attempt is the exception: it belongs to the window and
+        still reports its outcome.
+        """
+        cancel_owned_tasks(self)
+        # A copy, since the page updates it as actions complete while the list still shows the original
+        self.network = replace(network)
+        
+        self.network_name_label.set_label(network.ssid)
+        self._update_basic_info()
+        # The selected entry already carries the scan data, so the page is complete right away;
+        # the background lookup only patches whatever changed since the scan
+        self._update_advanced_info(network)
+        self.scrolled_window.get_vadjustment().set_value(0)
+        
+        self._recreate_action_buttons()
         self._load_advanced_info()
     
+    def refresh(self):
+        """Reload the bound network from NetworkManager's current results, without scanning"""
+        if self.network is None:
+            return
+        NetworkService.details_async(
+            self.network.ssid, callback=self._on_refreshed, on_error=lambda error: None,
+            owner=self, max_age=0
+        )
+    
+    def _on_refreshed(self, network: Optional[NetworkInfo]):
+        """Apply fresh signal data; a network that went out of range keeps its last values"""
+        if network is None:
+            return
+        # The connection state is tracked by this page's own actions
+        self.network = replace(network, is_connected=self.network.is_connected)
+        self._update_basic_info()
+        self._update_advanced_info(network)
+    
     def _create_header(self):
         """Create header with back button and network name"""
         header_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
@@ -40,13 +91,13 @@ class NetworkDetailsWidget(Gtk.Box):
         back_button.set_halign(Gtk.Align.START)
         back_button.connect("clicked", lambda _: self.on_back_clicked())
         
-        network_name_label = Gtk.Label(label=self.network.ssid)
-        network_name_label.set_xalign(0)
-        network_name_label.set_hexpand(True)
-        network_name_label.set_css_classes(["title-2"])
+        self.network_name_label = Gtk.Label()
+        self.network_name_label.set_xalign(0)
+        self.network_name_label.set_hexpand(True)
+        self.network_name_label.set_css_classes(["title-2"])
         
         header_box.append(back_button)
-        header_box.append(network_name_label)
+        header_box.append(self.network_name_label)
         
         self.append(header_box)
         self.append(Gtk.Separator())
@@ -60,26 +111,27 @@ class NetworkDetailsWidget(Gtk.Box):
         self.content_box.set_margin_bottom(20)
         self.content_box.set_vexpand(True)
         
-        # Basic information
-        status_text = "Connected" if self.network.is_connected else "Not connected"
+        # Basic information, filled in by bind()
         self.status_row = UIUtils.create_detail_row(
-            "Network Status", status_text, "network-transmit-receive-symbolic"
+            "Network Status", "", "network-transmit-receive-symbolic"
         )
         self.content_box.append(self.status_row)
         
         self.signal_row = UIUtils.create_detail_row(
-            "Signal Strength", f"{self.network.signal}%",
-            UIUtils.get_signal_icon_name(self.network.signal)
+            "Signal Strength", "", "network-wireless-signal-excellent-symbolic"
         )
         self.content_box.append(self.signal_row)
         
-        security_status = "Secured" if self.network.requires_password else "Open"
-        security_icon = "security-high-symbolic" if self.network.requires_password else "security-low-symbolic"
         self.security_row = UIUtils.create_detail_row(
-            "Security", security_status, security_icon
+            "Security", "", "security-high-symbolic"
         )
         self.content_box.append(self.security_row)
         
+        self.saved_row = UIUtils.create_detail_row(
+            "Saved Profile", "", "document-save-symbolic"
+        )
+        self.content_box.append(self.saved_row)
+        
         # Advanced section
         self.content_box.append(Gtk.Separator())
         
@@ -92,11 +144,47 @@ class NetworkDetailsWidget(Gtk.Box):
         # Create advanced detail rows
         self._create_advanced_rows()
         
-        scrolled_window = Gtk.ScrolledWindow(vexpand=True)
-        scrolled_window.set_policy(Gtk.PolicyType.NEVER, Gtk.PolicyType.AUTOMATIC)
-        scrolled_window.set_child(self.content_box)
+        # Every access point broadcasting this SSID
+        self.content_box.append(Gtk.Separator())
+        
+        access_points_header = Gtk.Label(label="Access Points")
+        access_points_header.set_xalign(0)
+        access_points_header.set_css_classes(["title-4"])
+        access_points_header.set_margin_top(10)
+        self.content_box.append(access_points_header)
+        
+        self.access_points_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=12)
+        self.content_box.append(self.access_points_box)
         
-        self.append(scrolled_window)
+        self.scrolled_window = Gtk.ScrolledWindow(vexpand=True)
+        self.scrolled_window.set_policy(Gtk.PolicyType.NEVER, Gtk.PolicyType.AUTOMATIC)
+        self.scrolled_window.set_child(self.content_box)
+        
+        self.append(self.scrolled_window)
+    
+    def _update_basic_info(self):
+        """Fill the status, signal and security rows from the bound network"""
+        self._update_row(self.status_row, "Connected" if self.network.is_connected else "Not connected")
+        
+        self._update_row(self.signal_row, f"{self.network.signal}%")
+        self._update_row_icon(self.signal_row, UIUtils.get_signal_icon_name(self.network.signal))
+        
+        secured = self.network.requires_password
+        self._update_row(self.security_row, "Secured" if secured else "Open")
+        self._update_row_icon(self.security_row, "security-high-symbolic" if secured else "security-low-symbolic")
+        
+        self._update_row(self.saved_row, self._saved_summary())
+    
+    def _saved_summary(self) -> str:
+        """Describe the saved profile joined into the scan result"""
+        if self.network.is_saved is None:
+            return "Unknown"
+        if not self.network.is_saved:
+            return "Not saved"
+        if not self.network.last_connected:
+            return "Saved, never connected"
+        last = time.strftime("%Y-%m-%d %H:%M", time.localtime(self.network.last_connected))
+        return f"Last connected {last}"
     
     def _create_advanced_rows(self):
         """Create advanced information rows"""
@@ -116,8 +204,13 @@ class NetworkDetailsWidget(Gtk.Box):
     
     def _create_action_buttons(self):
         """Create action buttons (connect/disconnect/forget) at the bottom"""
+        # Buttons from the previous row must not be updated any more
+        self.join_button = self.cancel_button = None
+        self.disconnect_button = self.forget_button = None
+        
         # Create a separator before buttons
-        self.append(Gtk.Separator())
+        self.action_separator = Gtk.Separator()
+        self.append(self.action_separator)
         
         # Create button container
         button_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
@@ -127,15 +220,23 @@ class NetworkDetailsWidget(Gtk.Box):
         button_box.set_margin_bottom(20)
         button_box.set_homogeneous(True)
         
-        # Check if network is known (saved)
-        is_known = NetworkService.is_wifi_known(self.network.ssid)
-        
         # Join Network button - only show if not connected
         if not self.network.is_connected:
             self.join_button = Gtk.Button(label="Join Network")
             self.join_button.set_css_classes(["suggested-action"])
             self.join_button.connect("clicked", self._on_join_clicked)
             button_box.append(self.join_button)
+            
+            # Cancel button - only shown while a connection attempt is running
+            self.cancel_button = Gtk.Button(label="Cancel", visible=False)
+            self.cancel_button.connect("clicked", self._on_cancel_clicked)
+            button_box.append(self.cancel_button)
+            
+            # Shown again while an attempt started earlier is still running
+            if self.connecting_ssid == self.network.ssid:
+                self.join_button.set_sensitive(False)
+                self.join_button.set_label("Connecting...")
+                self.cancel_button.set_visible(True)
         
         # Disconnect button - only show if connected
         if self.network.is_connected:
@@ -144,24 +245,62 @@ class NetworkDetailsWidget(Gtk.Box):
             self.disconnect_button.connect("clicked", self._on_disconnect_clicked)
             button_box.append(self.disconnect_button)
         
-        # Forget button - only show if network is known/saved
-        if is_known:
-            self.forget_button = Gtk.Button(label="Forget Network")
-            self.forget_button.set_css_classes(["destructive-action"])
-            self.forget_button.connect("clicked", self._on_forget_clicked)
-            button_box.append(self.forget_button)
-        
-        # Only append button box if there are buttons to show
-        if not self.network.is_connected or is_known:
-            self.append(button_box)
+        # Forget button - only shown once the network turns out to be known/saved
+        self.forget_button = Gtk.Button(label="Forget Network", visible=False)
+        self.forget_button.set_css_classes(["destructive-action"])
+        self.forget_button.connect("clicked", self._on_forget_clicked)
+        button_box.append(self.forget_button)
+        
+        # Holds the forget button's place while the saved profiles are checked
+        self.forget_spinner = Gtk.Spinner(spinning=True, halign=Gtk.Align.CENTER)
+        button_box.append(self.forget_spinner)
+        
+        self.action_box = button_box
+        self.append(button_box)
+        
+        # Scan results normally say whether the network is saved; ask only if they couldn't
+        if self.network.is_saved is not None:
+            self._on_known_checked(self.network.is_saved)
+            return
+        
+        self.known_check = NetworkService.is_known_async(
+            self.network.ssid,
+            callback=self._on_known_checked,
+            on_error=lambda error: self._on_known_checked(False),
+            owner=self
+        )
+    
+    def _on_known_checked(self, is_known: bool):
+        """Show the forget button for saved networks"""
+        self.known_check = None
+        self.forget_spinner.set_visible(False)
+        self.forget_button.set_visible(is_known)
+        
+        # Hide the button row if there is nothing to show
+        has_buttons = not self.network.is_connected or is_known
+        self.action_separator.set_visible(has_buttons)
+        self.action_box.set_visible(has_buttons)
     
     def _on_join_clicked(self, button):
         """Handle join network button click"""
         button.set_sensitive(False)
         button.set_label("Connecting...")
         
+        if self.network.is_saved is not None:
+            self._join_network(self.network.is_saved)
+            return
+        
         # Check if network is already known (has saved password)
-        if NetworkService.is_wifi_known(self.network.ssid):
+        NetworkService.is_known_async(
+            self.network.ssid,
+            callback=self._join_network,
+            on_error=lambda error: self._join_network(False),
+            owner=self
+        )
+    
+    def _join_network(self, is_known: bool):
+        """Connect with the saved profile, or ask for a password if one is needed"""
+        if is_known:
             self._connect_to_network(self.network.ssid)
         elif self.network.requires_password:
             # Show password dialog
@@ -177,7 +316,7 @@ class NetworkDetailsWidget(Gtk.Box):
                 self._connect_to_network(self.network.ssid, password)
             else:
                 # Password was empty or dialog was cancelled, re-enable join button
-                if hasattr(self, 'join_button'):
+                if self.join_button is not None:
                     self.join_button.set_sensitive(True)
                     self.join_button.set_label("Join Network")
         
@@ -190,20 +329,53 @@ class NetworkDetailsWidget(Gtk.Box):
     
     def _connect_to_network(self, ssid: str, password: str = None):
         """Connect to a network"""
-        def connect_thread():
-            success, message = NetworkService.connect_to_network(ssid, password)
-            GLib.idle_add(self._connection_complete, success, message)
-        
-        thread = threading.Thread(target=connect_thread)
-        thread.daemon = True
-        thread.start()
+        self.connecting_ssid = ssid
+        self.cancel_button.set_sensitive(True)
+        self.cancel_button.set_visible(True)
+        NetworkService.connect_async(
+            ssid, password,
+            callback=lambda result: self._connection_complete(ssid, *result),
+            on_error=lambda error: self._connection_complete(ssid, False, str(error)),
+            # Owned by the window, so showing another network doesn't drop the outcome
+            owner=self.get_root(),
+            on_progress=lambda state, reason: self._on_connection_progress(ssid, state, reason)
+        )
+    
+    def _on_connection_progress(self, ssid, state, reason):
+        """Show the current activation stage on the join button"""
+        if self.join_button is not None and ssid == self.network.ssid:
+            self.join_button.set_label(UIUtils.get_activation_label(state))
+    
+    def _on_cancel_clicked(self, button):
+        """Abandon the connection attempt in progress"""
+        button.set_sensitive(False)
+        if self.join_button is not None:
+            self.join_button.set_label("Cancelling...")
+        NetworkService.cancel_connect_async(owner=self)
     
-    def _connection_complete(self, success, message):
+    def _connection_complete(self, ssid, success, message, cancelled=False):
         """Handle connection completion"""
+        if self.connecting_ssid == ssid:
+            self.connecting_ssid = None
+        
+        if ssid != self.network.ssid:
+            # The page shows another network by now; only report the outcome
+            if success:
+                self._show_action_result("Connected", f"Successfully connected to {ssid}")
+            elif not cancelled:
+                self._show_action_result("Connection Failed", f"Failed to connect to {ssid}: {message}")
+            return False
+        
+        if self.cancel_button is not None:
+            self.cancel_button.set_visible(False)
+        
         if success:
-            # Update network status
+            # Update network status; connecting saves a profile if there wasn't one
             self.network.is_connected = True
-            self._update_row(self.status_row, "Connected")
+            if not self.network.is_saved:
+                self.network.is_saved = True
+                self.network.last_connected = int(time.time())
+            self._update_basic_info()
             
             # Show success message
             self._show_action_result("Connected", f"Successfully connected to {self.network.ssid}")
@@ -211,11 +383,12 @@ class NetworkDetailsWidget(Gtk.Box):
             # Remove join button and recreate action buttons
             self._recreate_action_buttons()
         else:
-            # Show error message
-            self._show_action_result("Connection Failed", f"Failed to connect: {message}")
+            # Show error message, unless the user cancelled
+            if not cancelled:
+                self._show_action_result("Connection Failed", f"Failed to connect: {message}")
             
             # Re-enable join button
-            if hasattr(self, 'join_button'):
+            if self.join_button is not None:
                 self.join_button.set_sensitive(True)
                 self.join_button.set_label("Join Network")
         
@@ -226,13 +399,12 @@ class NetworkDetailsWidget(Gtk.Box):
         button.set_sensitive(False)
         button.set_label("Disconnecting...")
         
-        def disconnect_thread():
-            success, message = NetworkService.disconnect_network(self.network.ssid)
-            GLib.idle_add(self._disconnect_complete, success, message)
-        
-        thread = threading.Thread(target=disconnect_thread)
-        thread.daemon = True
-        thread.start()
+        NetworkService.disconnect_async(
+            self.network.ssid,
+            callback=lambda result: self._disconnect_complete(*result),
+            on_error=lambda error: self._disconnect_complete(False, str(error)),
+            owner=self
+        )
     
     def _on_forget_clicked(self, button):
         """Handle forget button click"""
@@ -262,33 +434,35 @@ class NetworkDetailsWidget(Gtk.Box):
         if self.network.is_connected:
             button.set_label("Disconnecting...")
             
-            def disconnect_then_forget_thread():
-                # First disconnect
-                success, message = NetworkService.disconnect_network(self.network.ssid)
-                if success:
-                    # Update network status
-                    self.network.is_connected = False
-                    # Then forget
-                    success, message = NetworkService.forget_wifi(self.network.ssid)
-                    GLib.idle_add(self._forget_complete, success, message, True)  # True indicates disconnection happened
-                else:
-                    # Disconnect failed, show error
-                    GLib.idle_add(self._forget_complete, False, f"Failed to disconnect before forgetting: {message}", False)
+            def on_disconnected(result):
+                success, message = result
+                if not success:
+                    self._forget_complete(False, f"Failed to disconnect before forgetting: {message}", False)
+                    return
+                # Then forget; True indicates disconnection happened
+                NetworkService.forget_async(
+                    self.network.ssid,
+                    callback=lambda result: self._forget_complete(*result, True),
+                    on_error=lambda error: self._forget_complete(False, str(error), True),
+                    owner=self
+                )
             
-            thread = threading.Thread(target=disconnect_then_forget_thread)
-            thread.daemon = True
-            thread.start()
+            # First disconnect
+            NetworkService.disconnect_async(
+                self.network.ssid, callback=on_disconnected,
+                on_error=lambda error: on_disconnected((False, str(error))), owner=self
+            )
         else:
             # Network not connected, just forget
             button.set_label("Forgetting...")
             
-            def forget_thread():
-                success, message = NetworkService.forget_wifi(self.network.ssid)
-                GLib.idle_add(self._forget_complete, success, message, False)  # False indicates no disconnection
-        
-            thread = threading.Thread(target=forget_thread)
-            thread.daemon = True
-            thread.start()
+            # False indicates no disconnection
+            NetworkService.forget_async(
+                self.network.ssid,
+                callback=lambda result: self._forget_complete(*result, False),
+                on_error=lambda error: self._forget_complete(False, str(error), False),
+                owner=self
+            )
 
     def _disconnect_complete(self, success, message):
         """Handle disconnect completion"""
@@ -307,7 +481,7 @@ class NetworkDetailsWidget(Gtk.Box):
             self._show_action_result("Disconnect Failed", f"Failed to disconnect: {message}")
             
             # Re-enable button
-            if hasattr(self, 'disconnect_button'):
+            if self.disconnect_button is not None:
                 self.disconnect_button.set_sensitive(True)
                 self.disconnect_button.set_label("Disconnect")
         
@@ -318,8 +492,15 @@ class NetworkDetailsWidget(Gtk.Box):
         if success:
             # Update UI if disconnection happened
             if was_disconnected:
+                self.network.is_connected = False
                 self._update_row(self.status_row, "Not connected")
             
+            self.network.is_saved = False
+            self.network.profile_uuid = None
+            self.network.autoconnect_priority = None
+            self.network.last_connected = None
+            self._update_basic_info()
+            
             # Show success message
             action_text = "disconnected and forgotten" if was_disconnected else "forgotten"
             self._show_action_result("Network Forgotten", f"Successfully {action_text} {self.network.ssid}")
@@ -331,7 +512,7 @@ class NetworkDetailsWidget(Gtk.Box):
             self._show_action_result("Forget Failed", f"Failed to forget network: {message}")
             
             # Re-enable button
-            if hasattr(self, 'forget_button'):
+            if self.forget_button is not None:
                 self.forget_button.set_sensitive(True)
                 self.forget_button.set_label("Forget Network")
         
@@ -347,47 +528,36 @@ class NetworkDetailsWidget(Gtk.Box):
     
     def _recreate_action_buttons(self):
         """Recreate action buttons after network state changes"""
-        # Remove the last child if it's a button box
-        last_child = self.get_last_child()
-        if last_child and isinstance(last_child, Gtk.Box):
-            # Check if it contains buttons
-            first_button_child = last_child.get_first_child()
-            if first_button_child and isinstance(first_button_child, Gtk.Button):
-                self.remove(last_child)
-                # Also remove separator if it exists
-                new_last_child = self.get_last_child()
-                if new_last_child and isinstance(new_last_child, Gtk.Separator):
-                    self.remove(new_last_child)
+        # Remove the current button row and its separator
+        if self.action_box is not None:
+            if self.known_check is not None:
+                self.known_check.cancel()
+            self.remove(self.action_box)
+            self.remove(self.action_separator)
         
         # Recreate action buttons
         self._create_action_buttons()
     
     def _load_advanced_info(self):
         """Load advanced network information in background"""
-        def load_info_thread():
-            try:
-                wifi_details = None
-                for wifi in nmcli.device.wifi():
-                    if wifi.ssid == self.network.ssid:
-                        wifi_details = wifi
-                        break
-                
-                GLib.idle_add(self._update_advanced_info, wifi_details)
-                
-            except Exception as e:
-                print(f"Error loading advanced info: {e}")
-                GLib.idle_add(self._show_advanced_info_error)
-        
-        thread = threading.Thread(target=load_info_thread)
-        thread.daemon = True
-        thread.start()
+        def on_error(error):
+            print(f"Error loading advanced info: {error}")
+            # Rows filled from the scan stay as they are
+            if not self.network.bssid:
+                self._show_advanced_info_error()
+        
+        # Stale entries are refreshed with a directed scan for just this network
+        NetworkService.details_async(
+            self.network.ssid, callback=self._update_advanced_info, on_error=on_error, owner=self,
+            rescan=True
+        )
     
     def _update_advanced_info(self, wifi_details):
         """Update UI with network information"""
         if wifi_details:
             updates = {
-                "Frequency": f"{wifi_details.freq/1000:.1f} GHz" if wifi_details.freq else "N/A",
-                "Channel": str(wifi_details.chan) if wifi_details.chan else "N/A",
+                "Frequency": f"{wifi_details.frequency/1000:.1f} GHz" if wifi_details.frequency else "N/A",
+                "Channel": str(wifi_details.channel) if wifi_details.channel else "N/A",
                 "BSSID": wifi_details.bssid or "N/A",
                 "Speed": f"{wifi_details.rate} Mbps" if wifi_details.rate else "N/A",
                 "Mode": wifi_details.mode or "N/A",
@@ -398,15 +568,56 @@ class NetworkDetailsWidget(Gtk.Box):
         
         for field, value in updates.items():
             self._update_row(self.advanced_rows[field], value)
+        
+        if wifi_details:
+            self._update_access_points(wifi_details.access_points)
+    
+    def _update_access_points(self, access_points):
+        """Show one row per BSSID, the AP we'd associate with first"""
+        shown = tuple(
+            (ap.bssid, ap.signal, ap.frequency, ap.channel, ap.is_connected) for ap in access_points or []
+        )
+        if shown == self.shown_access_points:
+            return
+        self.shown_access_points = shown
+        
+        UIUtils.clear_container(self.access_points_box)
+        
+        if not access_points:
+            self.access_points_box.append(
+                UIUtils.create_detail_row("BSSID", "Loading...", "network-wireless-symbolic")
+            )
+            return
+        
+        for ap in access_points:
+            details = [f"{ap.signal}%"]
+            if ap.band:
+                details.append(ap.band)
+            if ap.channel:
+                details.append(f"channel {ap.channel}")
+            if ap.is_connected:
+                details.append("in use")
+            
+            self.access_points_box.append(UIUtils.create_detail_row(
+                ap.bssid or "Unknown BSSID", ", ".join(details),
+                UIUtils.get_signal_icon_name(ap.signal)
+            ))
     
     def _update_row(self, row, value):
         """Update the value of a detail row"""
         child = row.get_last_child()
         if child and isinstance(child, Gtk.Box):
             value_label = child.get_last_child()
-            if value_label and isinstance(value_label, Gtk.Label):
+            # Refreshes repeat most values, so only touch labels that change
+            if value_label and isinstance(value_label, Gtk.Label) and value_label.get_label() != str(value):
                 value_label.set_label(str(value))
     
+    def _update_row_icon(self, row, icon_name):
+        """Update the icon of a detail row"""
+        icon = row.get_first_child()
+        if icon and isinstance(icon, Gtk.Image) and icon.get_icon_name() != icon_name:
+            icon.set_from_icon_name(icon_name)
+    
     def _show_advanced_info_error(self):
         """Show error for advanced info loading"""
         for field in self.advanced_rows:
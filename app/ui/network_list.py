@@ -1,21 +1,123 @@
 import time
-import threading
 import gi
 gi.require_version("Gtk", "4.0")
-from gi.repository import Gtk, GLib
-from typing import List, Callable
+from gi.repository import Gtk, Gio, GObject
+from typing import Callable, Dict, List, Optional
 
 from network_service import NetworkService, NetworkInfo
+from ui.utils import UIUtils
+from background import main_loop_callback
+from startup_trace import StartupTrace
+from profiler import Profiler
+
+class NetworkItem(GObject.Object):
+    """List model item wrapping the NetworkInfo shown in one row"""
+    
+    __gtype_name__ = "NmguiNetworkItem"
+    
+    network = GObject.Property(type=object)
+    
+    def __init__(self, network: NetworkInfo):
+        super().__init__()
+        self.network = network
+
+class NetworkRow(Gtk.Box):
+    """A network row (connect button plus details button) recycled by the list view"""
+    
+    def __init__(self, on_network_selected: Callable, on_network_details: Callable):
+        super().__init__(orientation=Gtk.Orientation.HORIZONTAL, spacing=5)
+        self.network: Optional[NetworkInfo] = None
+        self.bound_item: Optional[NetworkItem] = None
+        self.notify_handler: Optional[int] = None
+        
+        network_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=5)
+        network_box.set_margin_top(2)
+        network_box.set_margin_bottom(2)
+        
+        # Signal strength
+        self.signal_icon = Gtk.Image()
+        self.signal_icon.set_pixel_size(16)
+        network_box.append(self.signal_icon)
+        
+        # Network name
+        self.name_label = Gtk.Label(xalign=0, hexpand=True)
+        network_box.append(self.name_label)
+        
+        # Saved-profile badge
+        self.saved_label = Gtk.Label(label="Saved", name="saved-label")
+        network_box.append(self.saved_label)
+        
+        # Connected indicator
+        self.connected_icon = Gtk.Image.new_from_icon_name("object-select-symbolic")
+        self.connected_icon.set_pixel_size(16)
+        self.connected_icon.set_margin_start(5)
+        self.connected_icon.set_name("connected-icon")
+        network_box.append(self.connected_icon)
+        
+        # Security indicator
+        self.lock_icon = Gtk.Image.new_from_icon_name("system-lock-screen-symbolic")
+        self.lock_icon.set_pixel_size(16)
+        network_box.append(self.lock_icon)
+        
+        # Main network button
+        self.network_button = Gtk.Button(hexpand=True)
+        self.network_button.set_name("network-button")
+        self.network_button.set_child(network_box)
+        self.network_button.connect("clicked", lambda b: on_network_selected(self.network))
+        
+        # More button
+        more_button = Gtk.Button()
+        more_button.set_icon_name("go-next-symbolic")
+        more_button.set_tooltip_text("More Details")
+        more_button.set_css_classes(["more-details-button"])
+        more_button.connect("clicked", lambda b: on_network_details(self.network))
+        
+        self.append(self.network_button)
+        self.append(more_button)
+    
+    def update(self, network: NetworkInfo):
+        """Show network in this row, touching only what changed"""
+        previous, self.network = self.network, network
+        if previous == network:
+            return
+        
+        # Periodic refreshes mostly move the signal, so leave everything else alone
+        icon_name = UIUtils.get_signal_icon_name(network.signal)
+        if previous is None or icon_name != UIUtils.get_signal_icon_name(previous.signal):
+            self.signal_icon.set_from_icon_name(icon_name)
+        if previous is None or network.signal != previous.signal:
+            self.signal_icon.set_tooltip_text(f"{network.signal}%")
+        if previous is not None and (network.ssid, network.is_connected, network.requires_password,
+                                     network.is_saved) == \
+                (previous.ssid, previous.is_connected, previous.requires_password, previous.is_saved):
+            return
+        
+        self.name_label.set_label(network.ssid)
+        self.saved_label.set_visible(bool(network.is_saved) and not network.is_connected)
+        self.connected_icon.set_visible(network.is_connected)
+        self.lock_icon.set_visible(network.requires_password)
+        
+        # The connected network can't be joined again
+        self.network_button.set_sensitive(not network.is_connected)
+        if network.is_connected:
+            self.network_button.add_css_class("connected-network")
+        else:
+            self.network_button.remove_css_class("connected-network")
 
 class NetworkListWidget(Gtk.Box):
     """Widget for displaying network list with visual rescan feedback"""
     
-    def __init__(self, on_network_selected: Callable, on_network_details: Callable):
+    def __init__(self, on_network_selected: Callable, on_network_details: Callable,
+                 on_cancel_connect: Optional[Callable] = None):
         super().__init__(orientation=Gtk.Orientation.VERTICAL, spacing=10)
         self.on_network_selected = on_network_selected
         self.on_network_details = on_network_details
+        self.on_cancel_connect = on_cancel_connect
         self.is_scanning = False
+        # A quiet reload without rescanning; never holds up a scan
+        self._refreshing = False
         self.scan_start_time = None
+        self.items: Dict[str, NetworkItem] = {}
         
         self._create_header()
         self._create_network_list()
@@ -31,25 +133,73 @@ class NetworkListWidget(Gtk.Box):
         
         networks_label = Gtk.Label(label="Wi-Fi Networks", xalign=0, name="wifi-networks-label")
         
+        # Progress of a connection attempt, with a way to abandon it
+        self.connect_label = Gtk.Label(name="connect-status-label", visible=False)
+        self.cancel_label = Gtk.Label(label="Cancel", name="wifi-scan-label", visible=False)
+        self.cancel_label.set_cursor_from_name("pointer")
+        self.cancel_label.add_controller(self._create_click_controller(self._on_cancel_clicked))
+        
         header_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
         header_box.append(networks_label)
         header_box.append(Gtk.Box(hexpand=True))  # Spacer
+        header_box.append(self.connect_label)
+        header_box.append(self.cancel_label)
         header_box.append(self.spinner)
         header_box.append(self.scan_label)
         
         self.append(header_box)
     
     def _create_network_list(self):
-        """Create the scrollable network list"""
-        self.network_list_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=5, vexpand=True)
-        self.network_list_box.set_name("network-list-box")
+        """Create the scrollable network list; only visible rows are realized"""
+        self.store = Gio.ListStore(item_type=NetworkItem)
+        self.sorter = Gtk.CustomSorter.new(self._compare_networks, None)
+        sort_model = Gtk.SortListModel(model=self.store, sorter=self.sorter)
+        
+        factory = Gtk.SignalListItemFactory()
+        factory.connect("setup", self._on_row_setup)
+        factory.connect("bind", self._on_row_bind)
+        factory.connect("unbind", self._on_row_unbind)
+        
+        self.network_list_view = Gtk.ListView(model=Gtk.NoSelection(model=sort_model), factory=factory)
+        self.network_list_view.set_name("network-list-box")
+        
+        # Message shown instead of rows (scanning, nothing found, errors)
+        self.placeholder = Gtk.Label(xalign=0.5, visible=False)
+        self.append(self.placeholder)
         
         scrolled_window = Gtk.ScrolledWindow(vexpand=True)
         scrolled_window.set_policy(Gtk.PolicyType.AUTOMATIC, Gtk.PolicyType.AUTOMATIC)
-        scrolled_window.set_child(self.network_list_box)
+        scrolled_window.set_child(self.network_list_view)
         
         self.append(scrolled_window)
     
+    @staticmethod
+    def _compare_networks(a: NetworkItem, b: NetworkItem, _user_data) -> int:
+        """Connected network first, then strongest signal"""
+        key_a = (not a.network.is_connected, -a.network.signal, a.network.ssid)
+        key_b = (not b.network.is_connected, -b.network.signal, b.network.ssid)
+        return (key_a > key_b) - (key_a < key_b)
+    
+    @Profiler.traced()
+    def _on_row_setup(self, factory, list_item):
+        list_item.set_child(NetworkRow(self.on_network_selected, self.on_network_details))
+    
+    @Profiler.traced()
+    def _on_row_bind(self, factory, list_item):
+        row = list_item.get_child()
+        item = list_item.get_item()
+        row.update(item.network)
+        row.bound_item = item
+        row.notify_handler = item.connect("notify::network", lambda obj, _pspec: row.update(obj.network))
+    
+    @Profiler.traced()
+    def _on_row_unbind(self, factory, list_item):
+        row = list_item.get_child()
+        if row.bound_item is not None:
+            row.bound_item.disconnect(row.notify_handler)
+            row.bound_item = None
+            row.notify_handler = None
+    
     def _create_click_controller(self, callback: Callable):
         """Create a click controller for a label"""
         controller = Gtk.GestureClick()
@@ -57,11 +207,31 @@ class NetworkListWidget(Gtk.Box):
         controller.connect("pressed", lambda *args: callback())
         return controller
     
+    @Profiler.traced()
     def _on_refresh_clicked(self):
         """Handle refresh button click with visual feedback"""
         if not self.is_scanning:
             self.start_scan()
     
+    def _on_cancel_clicked(self):
+        """Handle cancel button click while connecting"""
+        if self.cancel_label.get_sensitive() and self.on_cancel_connect:
+            self.cancel_label.set_sensitive(False)
+            self.on_cancel_connect()
+    
+    def show_connect_progress(self, text: str):
+        """Show how far a connection attempt has got"""
+        self.connect_label.set_label(text)
+        self.connect_label.set_visible(True)
+        self.cancel_label.set_visible(self.on_cancel_connect is not None)
+    
+    def hide_connect_progress(self):
+        """Remove the connection progress once the attempt is over"""
+        self.connect_label.set_visible(False)
+        self.cancel_label.set_visible(False)
+        self.cancel_label.set_sensitive(True)
+    
+    @Profiler.traced()
     def start_scan(self):
         """Start network scanning with visual feedback"""
         if self.is_scanning:
@@ -75,133 +245,149 @@ class NetworkListWidget(Gtk.Box):
         self.scan_label.set_sensitive(False)
         self.scan_label.add_css_class("rescan-in-progress")
         
-        # Clear existing networks
-        self._clear_network_list()
-        
-        # Show scanning message
-        scanning_label = Gtk.Label(label="Scanning for networks...")
-        scanning_label.set_margin_top(64)
-        scanning_label.set_name("scanning-label")
-        self.network_list_box.append(scanning_label)
+        # Keep the current rows visible while scanning; only an empty list gets a message
+        if not self.items:
+            self._show_scanning_label()
         
         # Start background scan
-        thread = threading.Thread(target=self._background_scan)
-        thread.daemon = True
-        thread.start()
-    
-    def _background_scan(self):
-        """Background network scanning"""
-        try:
-            networks = NetworkService.scan_networks(force_rescan=True)
-            scan_duration = time.time() - self.scan_start_time if self.scan_start_time else 0
-            
-            GLib.idle_add(self._update_network_list, networks, scan_duration)
-            
-        except Exception as e:
-            print(f"Error during background scan: {e}")
-            GLib.idle_add(self._show_scan_error)
-        finally:
-            GLib.idle_add(self._scan_complete)
+        self._background_scan(force_rescan=True)
     
-    def _update_network_list(self, networks: List[NetworkInfo], scan_duration: float):
-        """Update the network list UI with scan results"""
-        self._clear_network_list()
+    @Profiler.traced()
+    def load_cached(self):
+        """Draw the last scan result instantly and rescan in the background if it is stale"""
+        if self.is_scanning:
+            return
         
-        if not networks:
-            no_networks_label = Gtk.Label(label="No networks found", xalign=0.5)
-            no_networks_label.set_name("no-networks-label")
-            self.network_list_box.append(no_networks_label)
-        else:
-            sorted_networks = sorted(networks, key=lambda n: (not n.is_connected, -n.signal))
-            
-            for network in sorted_networks:
-                network_row = self._create_network_row(network)
-                self.network_list_box.append(network_row)
+        networks, revalidating = NetworkService.scan_networks_cached(
+            main_loop_callback(self._on_cache_refreshed, owner=self)
+        )
         
-        return False
+        if networks is not None:
+            self._update_network_list(networks, 0)
+            StartupTrace.mark("cached networks drawn")
+        
+        if revalidating:
+            if networks is not None:
+                # Dim the old results until the rescan replaces them
+                self.network_list_view.add_css_class("stale")
+            self.is_scanning = True
+            self.scan_start_time = time.time()
+            self.spinner.start()
+            self.scan_label.set_sensitive(False)
+            self.scan_label.add_css_class("rescan-in-progress")
+            
+            if networks is None:
+                self._show_scanning_label()
+    
+    def _on_cache_refreshed(self, networks: List[NetworkInfo]):
+        """Show the result of a background revalidation"""
+        scan_duration = time.time() - self.scan_start_time if self.scan_start_time else 0
+        self._update_network_list(networks, scan_duration)
+        StartupTrace.mark("first scan results")
+        self._scan_complete()
     
-    def _create_network_row(self, network: NetworkInfo) -> Gtk.Box:
-        """Create a row for a network with connect button and more button"""
-        row_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=5)
+    @Profiler.traced()
+    def refresh(self):
+        """Reload the list from NetworkManager's current results without rescanning"""
+        if self.is_scanning or self._refreshing:
+            return
         
-        # Main network button
-        network_button = self._create_network_button(network)
-        network_button.set_hexpand(True)
+        self._refreshing = True
+        NetworkService.scan_async(
+            False, callback=self._on_refresh_finished, on_error=self._on_refresh_failed, owner=self
+        )
+    
+    def _on_refresh_finished(self, networks: List[NetworkInfo]):
+        self._refreshing = False
+        # A scan started meanwhile will bring newer results
+        if not self.is_scanning:
+            self._update_network_list(networks, 0)
+    
+    def _on_refresh_failed(self, error: Exception):
+        # Keep the rows; the next refresh or scan will try again
+        self._refreshing = False
+        print(f"Error refreshing networks: {error}")
+    
+    def _show_scanning_label(self):
+        """Show a scanning message in place of the list"""
+        self._show_placeholder("Scanning for networks...", "scanning-label", margin_top=64)
+    
+    def _background_scan(self, force_rescan=True):
+        """Scan on a shared worker; results are dropped if this list is gone by then"""
+        NetworkService.scan_async(
+            force_rescan, callback=self._on_scan_finished, on_error=self._on_scan_failed, owner=self
+        )
+    
+    def _on_scan_finished(self, networks: List[NetworkInfo]):
+        scan_duration = time.time() - self.scan_start_time if self.scan_start_time else 0
+        self._update_network_list(networks, scan_duration)
+        StartupTrace.mark("first scan results")
+        self._scan_complete()
+    
+    def _on_scan_failed(self, error: Exception):
+        print(f"Error during background scan: {error}")
+        self._show_scan_error()
+        self._scan_complete()
+    
+    @staticmethod
+    def _row_key(network: NetworkInfo) -> str:
+        """Stable identity of a network across scans (one row per SSID)"""
+        return network.ssid
+    
+    @Profiler.traced()
+    def _update_network_list(self, networks: List[NetworkInfo], scan_duration: float):
+        """Reconcile the list model with scan results, reusing items for networks still present"""
+        if not networks:
+            self._clear_network_list()
+            self._show_placeholder("No networks found", "no-networks-label")
+            return False
         
-        # More button
-        more_button = Gtk.Button()
-        more_button.set_icon_name("go-next-symbolic")
-        more_button.set_tooltip_text("More Details")
-        more_button.set_css_classes(["more-details-button"])
-        more_button.connect("clicked", lambda b, n=network: self.on_network_details(n))
-     
-        row_box.append(network_button)
-        row_box.append(more_button)
+        self._remove_placeholder()
+        wanted = {self._row_key(network): network for network in networks}
         
-        return row_box
-    
-    def _create_network_button(self, network: NetworkInfo) -> Gtk.Button:
-        """Create a button for a network"""
-        network_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=5)
-        network_box.set_margin_top(2)
-        network_box.set_margin_bottom(2)
-
-        # Signal strength
-        signal_icon = self._get_signal_icon(network.signal)
-        network_box.append(signal_icon)
-
-        # Network name
-        network_label = Gtk.Label(label=network.ssid, xalign=0, hexpand=True)
-        network_box.append(network_label)
+        # Drop items for networks that disappeared
+        for key in [key for key in self.items if key not in wanted]:
+            found, position = self.store.find(self.items.pop(key))
+            if found:
+                self.store.remove(position)
         
-        # Connected indicator
-        if network.is_connected:
-            check_icon = Gtk.Image.new_from_icon_name("object-select-symbolic")
-            check_icon.set_pixel_size(16)
-            check_icon.set_margin_start(5)
-            check_icon.set_name("connected-icon")
-            network_box.append(check_icon)
+        # Update surviving items in place (bound rows follow via notify) and collect new ones
+        new_items = []
+        reordered = False
+        for key, network in wanted.items():
+            item = self.items.get(key)
+            if item is None:
+                item = NetworkItem(network)
+                self.items[key] = item
+                new_items.append(item)
+            elif item.network != network:
+                previous = item.network
+                item.network = network
+                reordered |= (previous.signal, previous.is_connected) != (network.signal, network.is_connected)
         
-        # Security indicator
-        if network.requires_password:
-            lock_icon = Gtk.Image.new_from_icon_name("system-lock-screen-symbolic")
-            lock_icon.set_pixel_size(16)
-            network_box.append(lock_icon)
-
-        # Create button
-        button = Gtk.Button()
-        button.set_name("network-button")
-        button.set_child(network_box) 
-
-        if network.is_connected:
-            button.set_sensitive(False)
-            button.add_css_class("connected-network")
-        else:
-            button.connect("clicked", lambda b, n=network: self.on_network_selected(n))
+        if new_items:
+            self.store.splice(self.store.get_n_items(), 0, new_items)
         
-        return button
-
-    def _get_signal_icon(self, signal: int) -> Gtk.Image:
-        """Get signal strength icon based on signal level"""
-        if signal < 20:
-            icon_name = "network-wireless-signal-weak-symbolic"
-        elif signal < 40:
-            icon_name = "network-wireless-signal-ok-symbolic"
-        elif signal < 60:
-            icon_name = "network-wireless-signal-good-symbolic"
-        else:
-            icon_name = "network-wireless-signal-excellent-symbolic"
+        # Signal and connection changes can move items, so let the sort model re-sort
+        if reordered:
+            self.sorter.changed(Gtk.SorterChange.DIFFERENT)
         
-        icon = Gtk.Image.new_from_icon_name(icon_name)
-        icon.set_pixel_size(16)
-        return icon
+        return False
+    
+    def _show_placeholder(self, text: str, name: str, margin_top: int = 0):
+        """Show a message label above the list (or alone when it is empty)"""
+        self.placeholder.set_label(text)
+        self.placeholder.set_name(name)
+        self.placeholder.set_margin_top(margin_top)
+        self.placeholder.set_visible(True)
+    
+    def _remove_placeholder(self):
+        self.placeholder.set_visible(False)
     
     def _show_scan_error(self):
         """Show scan error message"""
         self._clear_network_list()
-        error_label = Gtk.Label(label="Error scanning networks. Try again.", xalign=0.5)
-        error_label.set_name("error-label")
-        self.network_list_box.append(error_label)
+        self._show_placeholder("Error scanning networks. Try again.", "error-label")
         return False
     
     def _scan_complete(self):
@@ -209,14 +395,17 @@ class NetworkListWidget(Gtk.Box):
         self.spinner.stop()
         self.scan_label.set_sensitive(True)
         self.scan_label.remove_css_class("rescan-in-progress")
+        self.network_list_view.remove_css_class("stale")
         self.is_scanning = False
         
         return False
     
+    def clear(self):
+        """Drop every row, e.g. when Wi-Fi is switched off"""
+        self._clear_network_list()
+    
     def _clear_network_list(self):
         """Clear all networks from the list"""
-        child = self.network_list_box.get_first_child()
-        while child:
-            next_child = child.get_next_sibling()
-            self.network_list_box.remove(child)
-            child = next_child
+        self.store.remove_all()
+        self.items.clear()
+        self._remove_placeholder()
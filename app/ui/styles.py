@@ -46,6 +46,36 @@ class StyleManager:
 
     #network-list-box {
         padding: 5px 0;
+        background: none;
+    }
+
+    #network-list-box > row {
+        padding: 0 0 5px 0;
+        background: none;
+    }
+
+    #network-list-box.stale {
+        opacity: 0.6;
+    }
+
+    #debug-overlay {
+        font-family: monospace;
+        font-size: 10px;
+        color: #ffffff;
+        background-color: rgba(0, 0, 0, 0.75);
+        padding: 6px;
+        border-radius: 4px;
+    }
+
+    #connect-status-label {
+        font-size: 13px;
+        font-style: italic;
+        color: #888888;
+    }
+
+    #saved-label {
+        font-size: 11px;
+        color: #888888;
     }
 
     .connected-network {
@@ -4,6 +4,19 @@ import gi
 gi.require_version("Gtk", "4.0")
 from gi.repository import Gtk
 
+from models import ActivationState
+
+# What the UI shows while a connection goes through each activation stage
+ACTIVATION_LABELS = {
+    ActivationState.PREPARING: "Preparing...",
+    ActivationState.CONFIGURING: "Associating...",
+    ActivationState.NEED_AUTH: "Authenticating...",
+    ActivationState.IP_CONFIG: "Getting IP address...",
+    ActivationState.IP_CHECK: "Checking connectivity...",
+    ActivationState.ACTIVATED: "Connected",
+    ActivationState.FAILED: "Connection failed",
+}
+
 class UIUtils:
     """Utility functions for UI operations"""
     
@@ -19,6 +32,11 @@ class UIUtils:
         else:
             return "network-wireless-signal-excellent-symbolic"
     
+    @staticmethod
+    def get_activation_label(state: ActivationState) -> str:
+        """Get the progress text for a connection activation stage"""
+        return ACTIVATION_LABELS.get(state, "Connecting...")
+    
     @staticmethod
     def create_signal_icon(signal: int) -> Gtk.Image:
         """Create signal strength icon"""
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Check the D-Bus backend against a mocked NetworkManager.
+
+Starts a private system bus with python-dbusmock's networkmanager template,
+adds one WiFi device, three access points and a saved profile, then drives
+DBusBackend through scan, activate and delete. Needs python-dbusmock,
+dbus-python and dbus-daemon besides PyGObject; no NetworkManager or WiFi card.
+
+    python bench/check_dbus_backend.py
+"""
+
+import os
+import sys
+from typing import List
+
+import dbus
+import dbusmock
+from dbusmock.templates.networkmanager import (
+    DeviceState, InfrastructureMode, NM80211ApSecurityFlags
+)
+from gi.repository import Gio
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_DIR = os.path.join(BENCH_DIR, "..", "app")
+
+WIRELESS_IFACE = "org.freedesktop.NetworkManager.Device.Wireless"
+NM_BUS_NAME = "org.freedesktop.NetworkManager"
+SCAN_TIMEOUT = 2.0
+
+# (object name, SSID, BSSID, frequency, strength, security)
+ACCESS_POINTS = [
+    ("home_24", "Home", "AA:BB:CC:00:00:01", 2437, 80, NM80211ApSecurityFlags.NM_802_11_AP_SEC_KEY_MGMT_PSK),
+    ("home_5", "Home", "AA:BB:CC:00:00:02", 5180, 60, NM80211ApSecurityFlags.NM_802_11_AP_SEC_KEY_MGMT_PSK),
+    ("cafe", "Cafe", "AA:BB:CC:00:00:03", 2412, 40, NM80211ApSecurityFlags.NM_802_11_AP_SEC_NONE),
+]
+
+# The template's wireless device has neither property, and its RequestScan is a no-op
+REQUEST_SCAN = (
+    f"self.Set('{WIRELESS_IFACE}', 'LastScan', "
+    f"dbus.Int64(self.Get('{WIRELESS_IFACE}', 'LastScan') + 1))"
+)
+
+def populate(mock) -> str:
+    """Add the device, access points and saved profile; return the device path"""
+    device = mock.AddWiFiDevice("wlan0", "wlan0", DeviceState.DISCONNECTED)
+    for name, ssid, bssid, frequency, strength, security in ACCESS_POINTS:
+        mock.AddAccessPoint(device, name, ssid, bssid, InfrastructureMode.NM_802_11_MODE_INFRA,
+                            frequency, 54000, strength, security)
+    mock.AddWiFiConnection(device, "Home", "Home", "wpa-psk")
+
+    device_mock = dbus.Interface(
+        dbusmock.BusType.SYSTEM.get_connection().get_object(NM_BUS_NAME, device),
+        dbusmock.MOCK_IFACE
+    )
+    device_mock.AddProperty(WIRELESS_IFACE, "LastScan", dbus.Int64(0))
+    device_mock.AddProperty(WIRELESS_IFACE, "ActiveAccessPoint", dbus.ObjectPath("/"))
+    device_mock.AddMethod(WIRELESS_IFACE, "RequestScan", "a{sv}", "", REQUEST_SCAN)
+    return device
+
+def run_checks(backend) -> List[str]:
+    """Drive the backend through scan, activate and delete; return the failures"""
+    from models import ActivationState
+
+    failures = []
+
+    def check(ok: bool, what: str):
+        print(f"{'ok  ' if ok else 'FAIL'} {what}")
+        if not ok:
+            failures.append(what)
+
+    available, message = backend.check_available()
+    check(available, f"check_available ({message})")
+
+    networks = backend.rescan(SCAN_TIMEOUT)
+    bssids = {network.bssid: network for network in networks}
+    check(len(networks) == len(ACCESS_POINTS), f"rescan lists {len(networks)} access points")
+    home = bssids.get("AA:BB:CC:00:00:01")
+    check(home is not None and home.ssid == "Home" and home.requires_password,
+          "rescan decodes SSID and security")
+    check(bssids.get("AA:BB:CC:00:00:03") is not None and not bssids["AA:BB:CC:00:00:03"].requires_password,
+          "rescan reports the open network")
+
+    saved = backend.get_saved_connections()
+    check([connection.ssid for connection in saved] == ["Home"], "get_saved_connections finds the profile")
+    if not saved:
+        return failures
+    uuid = saved[0].uuid
+
+    states = []
+    try:
+        backend.activate_connection(uuid, "AA:BB:CC:00:00:02",
+                                    on_state=lambda state, reason: states.append(state))
+        check(ActivationState.ACTIVATED in states, "activate_connection reaches ACTIVATED")
+    except Exception as e:
+        check(False, f"activate_connection raised {e}")
+
+    check(backend.delete_connections([uuid]) == {}, "delete_connections removes the profile")
+    check(backend.get_saved_connections() == [], "no saved profiles left")
+    check(uuid in backend.delete_connections([uuid]), "deleting it again is reported as failed")
+    return failures
+
+def main() -> int:
+    sys.path.insert(0, os.path.abspath(APP_DIR))
+    from backends.dbus_backend import DBusBackend
+
+    with dbusmock.PrivateDBus(dbusmock.BusType.SYSTEM) as bus:
+        with dbusmock.SpawnedMock.spawn_with_template("networkmanager",
+                                                      bustype=dbusmock.BusType.SYSTEM) as server:
+            populate(dbus.Interface(server.obj, dbusmock.MOCK_IFACE))
+            connection = Gio.DBusConnection.new_for_address_sync(
+                bus.address,
+                Gio.DBusConnectionFlags.AUTHENTICATION_CLIENT
+                | Gio.DBusConnectionFlags.MESSAGE_BUS_CONNECTION,
+                None, None
+            )
+            failures = run_checks(DBusBackend(connection))
+
+    print(f"{len(failures)} check(s) failed" if failures else "All checks passed")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
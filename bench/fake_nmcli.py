@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""Scriptable stand-in for the nmcli command, used by the benchmarks.
+
+Answers the nmcli invocations nmgui makes from a JSON state file instead of
+talking to NetworkManager:
+
+    {"wifi_enabled": true,
+     "access_points": [{"ssid": ..., "bssid": ..., "mode": "Infra", "chan": 6,
+                        "freq": 2437, "rate": 130, "signal": 70,
+                        "security": "WPA2", "in_use": false}, ...],
+     "connections": [{"name": ..., "uuid": ..., "type": "802-11-wireless",
+                      "ssid": ..., "autoconnect_priority": 0,
+                      "timestamp": 0}, ...]}
+
+Mutating commands (connect, disconnect, delete, radio on/off, rescan) rewrite the state file.
+
+Environment:
+    NMGUI_FAKE_NMCLI_STATE       path of the state file (required)
+    NMGUI_FAKE_NMCLI_LATENCY_MS  delay added to every call (default 0)
+    NMGUI_FAKE_NMCLI_SCAN_MS     extra delay for a rescan (default 0)
+    NMGUI_FAKE_NMCLI_LOG         file that gets one line per invocation
+"""
+
+import json
+import os
+import sys
+import time
+import uuid as uuid_lib
+
+WIFI_TYPE = "802-11-wireless"
+
+# nmcli exit codes (see nmcli(1))
+EXIT_USAGE = 2
+EXIT_NOT_FOUND = 10
+
+def escape(value) -> str:
+    """Escape a value the way `nmcli -t` does"""
+    return str(value).replace("\\", "\\\\").replace(":", "\\:")
+
+def load_state(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+def save_state(path: str, state: dict) -> None:
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+
+def fail(message: str, status: int) -> int:
+    print(f"Error: {message}", file=sys.stderr)
+    return status
+
+def wifi_field(ap: dict, name: str) -> str:
+    values = {
+        "IN-USE": "*" if ap.get("in_use") else " ",
+        "BSSID": ap["bssid"],
+        "SSID": ap["ssid"],
+        "MODE": ap.get("mode", "Infra"),
+        "CHAN": ap["chan"],
+        "FREQ": f"{ap['freq']} MHz",
+        "RATE": f"{ap['rate']} Mbit/s",
+        "SIGNAL": ap["signal"],
+        "SECURITY": ap.get("security", ""),
+    }
+    return escape(values[name])
+
+def connection_field(conn: dict, name: str) -> str:
+    values = {
+        "NAME": conn["name"],
+        "UUID": conn["uuid"],
+        "TYPE": conn["type"],
+        "DEVICE": "",
+        "connection.id": conn["name"],
+        "connection.uuid": conn["uuid"],
+        "connection.type": conn["type"],
+        "connection.autoconnect-priority": conn.get("autoconnect_priority", 0),
+        "connection.timestamp": conn.get("timestamp", 0),
+        "802-11-wireless.ssid": conn.get("ssid", ""),
+    }
+    return str(values[name])
+
+def find_connection(state: dict, name: str):
+    for conn in state["connections"]:
+        if name in (conn["name"], conn["uuid"]):
+            return conn
+    return None
+
+def run(args, state_path: str) -> int:
+    # Global options come first: -t, -f FIELDS, -w SECONDS
+    fields = None
+    while args and args[0].startswith("-"):
+        option = args.pop(0)
+        if option in ("-f", "--fields", "-w", "--wait"):
+            value = args.pop(0)
+            if option in ("-f", "--fields"):
+                fields = value.split(",")
+        elif option not in ("-t", "--terse"):
+            return fail(f"unsupported option '{option}'", EXIT_USAGE)
+
+    state = load_state(state_path)
+    command = " ".join(args[:2])
+
+    if args[:2] == ["radio", "wifi"]:
+        if len(args) == 2:
+            print("enabled" if state.get("wifi_enabled", True) else "disabled")
+            return 0
+        state["wifi_enabled"] = args[2] == "on"
+        save_state(state_path, state)
+        return 0
+
+    if command == "general status":
+        print("STATE      CONNECTIVITY  WIFI-HW  WIFI     WWAN-HW  WWAN")
+        print("connected  full          enabled  enabled  enabled  enabled")
+        return 0
+
+    if command == "device status":
+        print("DEVICE  TYPE      STATE      CONNECTION")
+        print("wlan0   wifi      connected  --")
+        return 0
+
+    if command == "device monitor":
+        # Real state changes are not simulated; follow "forever" like nmcli does
+        while True:
+            time.sleep(60)
+
+    if command == "device disconnect":
+        for ap in state["access_points"]:
+            ap["in_use"] = False
+        save_state(state_path, state)
+        return 0
+
+    if args[:3] == ["device", "wifi", "list"]:
+        if "--rescan" in args and args[args.index("--rescan") + 1] == "yes":
+            time.sleep(float(os.environ.get("NMGUI_FAKE_NMCLI_SCAN_MS", "0")) / 1000)
+        fields = fields or ["IN-USE", "BSSID", "SSID", "MODE", "CHAN", "FREQ", "RATE", "SIGNAL", "SECURITY"]
+        for ap in state["access_points"]:
+            print(":".join(wifi_field(ap, name) for name in fields))
+        return 0
+
+    if args[:3] == ["device", "wifi", "rescan"]:
+        time.sleep(float(os.environ.get("NMGUI_FAKE_NMCLI_SCAN_MS", "0")) / 1000)
+        # A finished scan shows up as new signal readings for the probed SSIDs
+        ssids = [args[i + 1] for i in range(3, len(args) - 1) if args[i] == "ssid"]
+        for ap in state["access_points"]:
+            if not ssids or ap["ssid"] in ssids:
+                ap["signal"] += 1 if ap["signal"] < 100 else -1
+        save_state(state_path, state)
+        return 0
+
+    if args[:3] == ["device", "wifi", "connect"]:
+        ssid = args[3]
+        if not any(ap["ssid"] == ssid for ap in state["access_points"]):
+            return fail(f"No network with SSID '{ssid}' found.", EXIT_NOT_FOUND)
+        conn = next((c for c in state["connections"] if c.get("ssid") == ssid), None)
+        if conn is None:
+            conn = {"name": ssid, "uuid": str(uuid_lib.uuid4()), "type": WIFI_TYPE, "ssid": ssid}
+            state["connections"].append(conn)
+        conn["timestamp"] = int(time.time())
+        for ap in state["access_points"]:
+            ap["in_use"] = ap["ssid"] == ssid
+        save_state(state_path, state)
+        print(f"Device 'wlan0' successfully activated with '{conn['uuid']}'.")
+        return 0
+
+    if command == "connection show":
+        targets = args[2:]
+        if not targets:
+            fields = fields or ["NAME", "UUID", "TYPE", "DEVICE"]
+            for conn in state["connections"]:
+                print(":".join(escape(connection_field(conn, name)) for name in fields))
+            return 0
+
+        # `connection show [id|uuid] X [id|uuid] Y ...` prints each profile's fields in turn;
+        # this multiline view is never escaped, even with -t
+        fields = fields or ["connection.id", "connection.uuid", "connection.type",
+                            "connection.autoconnect-priority", "connection.timestamp", "802-11-wireless.ssid"]
+        while targets:
+            if targets[0] in ("id", "uuid"):
+                targets.pop(0)
+            conn = find_connection(state, targets.pop(0))
+            if conn is None:
+                return fail("no such connection profile.", EXIT_NOT_FOUND)
+            for name in fields:
+                print(f"{name}:{connection_field(conn, name)}")
+        return 0
+
+    if command == "connection delete":
+        # `connection delete [id|uuid] X [id|uuid] Y ...` deletes what it can, then reports the rest
+        targets = args[2:]
+        missing = []
+        while targets:
+            if targets[0] in ("id", "uuid"):
+                targets.pop(0)
+            target = targets.pop(0)
+            conn = find_connection(state, target)
+            if conn is None:
+                missing.append(target)
+                continue
+            state["connections"].remove(conn)
+            print(f"Connection '{conn['name']}' ({conn['uuid']}) successfully deleted.")
+        save_state(state_path, state)
+        if missing:
+            return fail(f"unknown connection '{missing[0]}'.", EXIT_NOT_FOUND)
+        return 0
+
+    if command in ("connection up", "connection down"):
+        target = args[3] if args[2] in ("id", "uuid") else args[2]
+        conn = find_connection(state, target)
+        if conn is None:
+            return fail(f"unknown connection '{target}'.", EXIT_NOT_FOUND)
+        # `connection up ... ap BSSID` pins the access point
+        bssid = args[args.index("ap") + 1] if "ap" in args[2:] else None
+        if bssid and not any(ap["bssid"] == bssid and ap["ssid"] == conn.get("ssid")
+                             for ap in state["access_points"]):
+            return fail(f"no access point with BSSID '{bssid}'.", EXIT_NOT_FOUND)
+        if command == "connection up":
+            conn["timestamp"] = int(time.time())
+        for ap in state["access_points"]:
+            ap["in_use"] = (command == "connection up" and ap["ssid"] == conn.get("ssid")
+                            and (bssid is None or ap["bssid"] == bssid))
+        save_state(state_path, state)
+        return 0
+
+    return fail(f"unsupported command '{' '.join(args)}'", EXIT_USAGE)
+
+def main() -> int:
+    args = sys.argv[1:]
+    log_path = os.environ.get("NMGUI_FAKE_NMCLI_LOG")
+    if log_path:
+        with open(log_path, "a") as f:
+            f.write(" ".join(args) + "\n")
+
+    time.sleep(float(os.environ.get("NMGUI_FAKE_NMCLI_LATENCY_MS", "0")) / 1000)
+    return run(args, os.environ["NMGUI_FAKE_NMCLI_STATE"])
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""Time NetworkService operations against a fake nmcli.
+
+Runs entirely offline: a generated (or given) scenario is served by
+fake_nmcli.py, which is put first on PATH as `nmcli`, and the service is
+pinned to the nmcli backend. Results are printed as JSON; pass the JSON of
+an earlier run to --compare to see how each operation moved.
+
+    python bench/run_benchmarks.py --output before.json
+    python bench/run_benchmarks.py --compare before.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_DIR = os.path.join(BENCH_DIR, "..", "app")
+
+AP_COUNTS = (10, 100, 500)
+PROFILE_COUNTS = (5, 50, 200)
+OPERATIONS = ("scan_networks", "is_wifi_known", "forget_wifi", "forget_networks",
+              "connect_to_network", "get_wifi_details")
+
+def make_scenario(ap_count: int, profile_count: int, seed: int = 0) -> dict:
+    """Build a reproducible set of access points and saved profiles"""
+    rng = random.Random(seed * 1000003 + ap_count * 1009 + profile_count)
+    # Roughly three APs per SSID, like a building with several access points per network
+    ssid_count = max(1, ap_count // 3)
+    ssids = [f"Network {i}" if i % 7 else f"Cafe:{i}\\guest" for i in range(ssid_count)]
+
+    access_points = []
+    for i in range(ap_count):
+        freq = rng.choice((2412, 2437, 2462, 5180, 5500, 5745))
+        access_points.append({
+            "ssid": ssids[i % ssid_count],
+            "bssid": ":".join(f"{rng.randrange(256):02X}" for _ in range(6)),
+            "mode": "Infra",
+            "chan": (freq - 2407) // 5 if freq < 5000 else (freq - 5000) // 5,
+            "freq": freq,
+            "rate": rng.choice((54, 130, 270, 540)),
+            "signal": rng.randrange(10, 100),
+            "security": rng.choice(("WPA2", "WPA2 WPA3", "WPA3", "")),
+            "in_use": i == 0,
+        })
+
+    # Saved profiles cover the visible networks first, then networks out of range
+    connections = []
+    for i in range(profile_count):
+        ssid = ssids[i] if i < ssid_count else f"Remembered {i}"
+        connections.append({
+            "name": ssid,
+            "uuid": f"00000000-0000-4000-8000-{i:012d}",
+            "type": "802-11-wireless",
+            "ssid": ssid,
+        })
+    return {"wifi_enabled": True, "access_points": access_points, "connections": connections}
+
+class FakeNmcli:
+    """Puts fake_nmcli.py on PATH as `nmcli` and manages its state file"""
+
+    def __init__(self, workdir: str, latency_ms: float, scan_ms: float):
+        self.state_path = os.path.join(workdir, "state.json")
+        self.log_path = os.path.join(workdir, "calls.log")
+
+        bin_dir = os.path.join(workdir, "bin")
+        os.makedirs(bin_dir)
+        wrapper = os.path.join(bin_dir, "nmcli")
+        with open(wrapper, "w") as f:
+            f.write(f'#!/bin/sh\nexec "{sys.executable}" "{os.path.join(BENCH_DIR, "fake_nmcli.py")}" "$@"\n')
+        os.chmod(wrapper, 0o755)
+
+        os.environ["PATH"] = bin_dir + os.pathsep + os.environ.get("PATH", "")
+        os.environ["NMGUI_FAKE_NMCLI_STATE"] = self.state_path
+        os.environ["NMGUI_FAKE_NMCLI_LOG"] = self.log_path
+        os.environ["NMGUI_FAKE_NMCLI_LATENCY_MS"] = str(latency_ms)
+        os.environ["NMGUI_FAKE_NMCLI_SCAN_MS"] = str(scan_ms)
+        # Keep scan snapshots out of the user's cache
+        os.environ["XDG_CACHE_HOME"] = os.path.join(workdir, "cache")
+
+    def load(self, scenario: dict) -> None:
+        with open(self.state_path, "w") as f:
+            json.dump(scenario, f)
+
+    def call_count(self) -> int:
+        if not os.path.exists(self.log_path):
+            return 0
+        with open(self.log_path) as f:
+            return sum(1 for _ in f)
+
+def measure(fake: FakeNmcli, scenario: dict, setup: Callable[[], None],
+            operation: Callable[[], object], iterations: int) -> dict:
+    """Run operation from a fresh scenario and cold caches; return timing stats in ms"""
+    timings = []
+    calls = 0
+    for _ in range(iterations):
+        fake.load(scenario)
+        setup()
+        before = fake.call_count()
+        start = time.perf_counter()
+        operation()
+        timings.append((time.perf_counter() - start) * 1000)
+        calls = fake.call_count() - before
+
+    return {
+        "iterations": iterations,
+        "min_ms": round(min(timings), 3),
+        "median_ms": round(statistics.median(timings), 3),
+        "mean_ms": round(statistics.fmean(timings), 3),
+        "max_ms": round(max(timings), 3),
+        "nmcli_calls": calls,
+    }
+
+def run_benchmarks(args) -> dict:
+    sys.path.insert(0, os.path.abspath(APP_DIR))
+
+    workdir = tempfile.mkdtemp(prefix="nmgui-bench-")
+    try:
+        fake = FakeNmcli(workdir, args.latency_ms, args.scan_ms)
+        # Imported only after PATH points at the fake nmcli
+        from network_service import NetworkService
+
+        def reset():
+            # Re-selecting the backend drops every cache, so each run starts cold
+            NetworkService.use_backend("nmcli")
+            NetworkService.backend()
+
+        if args.scenario:
+            with open(args.scenario) as f:
+                scenarios = [json.load(f)]
+        else:
+            scenarios = [make_scenario(aps, profiles, args.seed)
+                         for aps in args.access_points for profiles in args.profiles]
+
+        results = []
+        for scenario in scenarios:
+            connected = scenario["access_points"][0]["ssid"]
+            saved = scenario["connections"][0]["ssid"] if scenario["connections"] else connected
+            every_saved = [conn["ssid"] for conn in scenario["connections"]]
+            operations: Dict[str, Callable[[], object]] = {
+                "scan_networks": lambda: NetworkService.scan_networks(force_rescan=True),
+                "is_wifi_known": lambda: NetworkService.is_wifi_known(saved),
+                "forget_wifi": lambda: NetworkService.forget_wifi(saved),
+                "forget_networks": lambda: NetworkService.forget_networks(every_saved),
+                "connect_to_network": lambda: NetworkService.connect_to_network(connected),
+                "get_wifi_details": lambda: NetworkService.get_wifi_details(connected),
+            }
+            for name in args.operations:
+                # The service reports progress with print(); keep it out of the JSON
+                with contextlib.redirect_stdout(io.StringIO()):
+                    stats = measure(fake, scenario, reset, operations[name], args.iterations)
+                results.append({
+                    "operation": name,
+                    "access_points": len(scenario["access_points"]),
+                    "saved_profiles": len(scenario["connections"]),
+                    **stats,
+                })
+                print(f"{name:20} {results[-1]['access_points']:4} APs {results[-1]['saved_profiles']:4} profiles"
+                      f"  median {stats['median_ms']:9.2f} ms  {stats['nmcli_calls']:3} nmcli calls",
+                      file=sys.stderr)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "latency_ms": args.latency_ms,
+            "scan_ms": args.scan_ms,
+            "iterations": args.iterations,
+        },
+        "results": results,
+    }
+
+def compare(report: dict, baseline_path: str) -> None:
+    """Print each operation's median relative to a previous report"""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+
+    def key(result):
+        return result["operation"], result["access_points"], result["saved_profiles"]
+
+    previous = {key(result): result for result in baseline["results"]}
+    for result in report["results"]:
+        old: Optional[dict] = previous.get(key(result))
+        if old is None or not old["median_ms"]:
+            continue
+        change = (result["median_ms"] / old["median_ms"] - 1) * 100
+        print(f"{result['operation']:20} {result['access_points']:4} APs {result['saved_profiles']:4} profiles"
+              f"  {old['median_ms']:9.2f} -> {result['median_ms']:9.2f} ms  ({change:+.1f}%)",
+              file=sys.stderr)
+
+def parse_arguments(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Benchmark NetworkService against a fake nmcli")
+    parser.add_argument("--iterations", type=int, default=5, help="Runs per operation (default: 5)")
+    parser.add_argument("--latency-ms", type=float, default=5.0,
+                        help="Delay the fake nmcli adds to every call (default: 5)")
+    parser.add_argument("--scan-ms", type=float, default=0.0,
+                        help="Extra delay for a rescan (default: 0)")
+    parser.add_argument("--access-points", type=int, nargs="+", default=list(AP_COUNTS),
+                        help="Scenario sizes in access points (default: 10 100 500)")
+    parser.add_argument("--profiles", type=int, nargs="+", default=list(PROFILE_COUNTS),
+                        help="Scenario sizes in saved profiles (default: 5 50 200)")
+    parser.add_argument("--operations", nargs="+", choices=OPERATIONS, default=list(OPERATIONS))
+    parser.add_argument("--scenario", help="Replay a recorded state file instead of generated ones")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for generated scenarios")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    parser.add_argument("--compare", metavar="REPORT", help="Compare medians with an earlier report")
+    return parser.parse_args(argv)
+
+def main() -> int:
+    args = parse_arguments()
+    report = run_benchmarks(args)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.compare:
+        compare(report, args.compare)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())